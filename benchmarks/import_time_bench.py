@@ -0,0 +1,106 @@
+"""How long importing each presentations module takes.
+
+    python benchmarks/import_time_bench.py
+    python benchmarks/import_time_bench.py --budget-ms 15 --check
+
+Each module is imported in a fresh interpreter with -X importtime, --repeat
+times, and the best cumulative time is reported along with any heavy
+modules (numpy, asyncio, inspect, ...) the import dragged in. The time
+includes stdlib modules like functools and collections that a bare
+interpreter hasn't imported yet, so compare against "presentations.closures"
+which imports nothing. With --check
+it exits with status 1 if a module is over budget or imports something it
+shouldn't.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+MODULES = [
+    "presentations",
+    "presentations.accumulators",
+    "presentations.allocations",
+    "presentations.batching",
+    "presentations.buffered",
+    "presentations.closures",
+    "presentations.columnar",
+    "presentations.external_sort",
+    "presentations.fusion",
+    "presentations.indexed",
+    "presentations.loggers",
+    "presentations.memoize",
+    "presentations.multiprocess",
+    "presentations.parallel",
+    "presentations.pipeline",
+    "presentations.profiling",
+    "presentations.records",
+    "presentations.ring",
+    "presentations.sampling",
+    "presentations.shuffling",
+    "presentations.specialise",
+    "presentations.streaming",
+    "presentations.tracing",
+    "presentations.vectorise",
+]
+
+# Only to be imported when a function that needs them is called.
+HEAVY = ["numpy", "numba", "asyncio", "inspect", "concurrent.futures",
+         "multiprocessing", "json", "pickle", "tempfile"]
+
+# Modules that can't do anything without one of those.
+NEEDS = {
+    "presentations.allocations": ["pickle"],    # imported by tracemalloc
+}
+
+
+def import_time(module):
+    """(cumulative import time in ms, heavy modules it imported)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    total = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            total = int(cumulative) / 1000.0
+    allowed = NEEDS.get(module, [])
+    return total, [m for m in HEAVY if m in imported and m not in allowed]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=25.0,
+                        help="per module budget (default %(default)s)")
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args(argv)
+
+    print("python %s" % sys.version.split()[0])
+    failures = []
+    for module in MODULES:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        best = min(t for t, _ in runs)
+        heavy = runs[0][1]
+        print("%-32s %7.2f ms  %s" % (module, best, " ".join(heavy)))
+        if best > args.budget_ms:
+            failures.append("%s took %.2f ms, budget %.2f ms"
+                            % (module, best, args.budget_ms))
+        if heavy:
+            failures.append("%s imported %s" % (module, ", ".join(heavy)))
+    if args.check:
+        for failure in failures:
+            print("FAIL " + failure)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Time the Bad/Better/Best idioms from tips_tricks.py.
+
+    python benchmarks/tips_tricks_bench.py
+    python benchmarks/tips_tricks_bench.py --sizes 1e2,1e4 --check --margin 1.5
+
+For every idiom and every input size it prints the best of --repeat timings
+for each variant, in nanoseconds per element, and the scaling exponent
+between the smallest and largest size (1.0 is linear). With --check it exits
+with status 1 if, at any size, a Best variant isn't at least --margin times
+faster than the Bad one. --json writes the raw numbers for plotting.
+"""
+import argparse
+import json
+import math
+import sys
+import timeit
+
+
+# C-like looping: look for a value that's at the end of the list, the
+# tutorial's "1 in list1" finds it straight away which measures nothing.
+
+def membership_indexed(list1, target):
+    result = False
+    for i in range(len(list1)):
+        if list1[i] == target:
+            result = True
+            break
+    return result
+
+
+def membership_for(list1, target):
+    result = False
+    for val in list1:
+        if val == target:
+            result = True
+            break
+    return result
+
+
+def membership_in(list1, target):
+    return target in list1
+
+
+# Strings and concatenation
+
+def concat_plus(cpd_lst):
+    cpds = ""
+    for cpd in cpd_lst:
+        cpds += ", " + cpd
+    return cpds
+
+
+def concat_join(cpd_lst):
+    return ", ".join(cpd_lst)
+
+
+# Filtering and mapping
+
+def map_append(lst):
+    lst2 = []
+    for a in lst:
+        lst2.append(a * 2)
+    return lst2
+
+
+def map_comprehension(lst):
+    return [a * 2 for a in lst]
+
+
+def filter_append(lst):
+    lst2 = []
+    for a in lst:
+        if a % 2 == 0:
+            lst2.append(a * 2)
+    return lst2
+
+
+def filter_comprehension(lst):
+    return [a * 2 for a in lst if a % 2 == 0]
+
+
+# name: (setup(n) -> args, [(label, fn), ...] from Bad to Best)
+IDIOMS = {
+    "membership": (lambda n: (list(range(n)), n - 1),
+                   [("Bad", membership_indexed),
+                    ("Better", membership_for),
+                    ("Best", membership_in)]),
+    "concatenation": (lambda n: ([str(i) for i in range(n)],),
+                      [("Bad", concat_plus),
+                       ("Best", concat_join)]),
+    "map": (lambda n: (list(range(n)),),
+            [("Bad", map_append),
+             ("Best", map_comprehension)]),
+    "filter": (lambda n: (list(range(n)),),
+               [("Bad", filter_append),
+                ("Best", filter_comprehension)]),
+}
+
+
+def time_call(fn, args, repeat):
+    """Best time in seconds for one call of fn(*args)."""
+    timer = timeit.Timer(lambda: fn(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(sizes, repeat, idioms=None):
+    """{idiom: {label: {size: seconds}}}"""
+    results = {}
+    for name, (setup, variants) in IDIOMS.items():
+        if idioms and name not in idioms:
+            continue
+        results[name] = {label: {} for label, _ in variants}
+        for n in sizes:
+            args = setup(n)
+            for label, fn in variants:
+                results[name][label][n] = time_call(fn, args, repeat)
+    return results
+
+
+def exponent(timings):
+    sizes = sorted(timings)
+    if len(sizes) < 2 or timings[sizes[0]] <= 0:
+        return float("nan")
+    lo, hi = sizes[0], sizes[-1]
+    return math.log(timings[hi] / timings[lo]) / math.log(hi / lo)
+
+
+def report(results, out=sys.stdout):
+    for name, variants in results.items():
+        sizes = sorted(next(iter(variants.values())))
+        out.write("\n%s (ns per element)\n" % name)
+        out.write("%-8s" % "" + "".join("%12d" % n for n in sizes)
+                  + "    exponent\n")
+        for label, timings in variants.items():
+            out.write("%-8s" % label
+                      + "".join("%12.2f" % (timings[n] / n * 1e9)
+                                for n in sizes)
+                      + "%12.2f\n" % exponent(timings))
+
+
+def check(results, margin):
+    """Sizes at which Best doesn't beat Bad by margin, as messages."""
+    failures = []
+    for name, variants in results.items():
+        for n, bad in variants["Bad"].items():
+            best = variants["Best"][n]
+            if bad < best * margin:
+                failures.append("%s at n=%d: Bad/Best = %.2f, wanted >= %.2f"
+                                % (name, n, bad / best, margin))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1e2,1e3,1e4,1e5,1e6,1e7",
+                        help="comma separated input sizes (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--idiom", action="append", choices=sorted(IDIOMS),
+                        help="only run this idiom, can be repeated")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if a Best variant stops winning")
+    parser.add_argument("--margin", type=float, default=1.1,
+                        help="how many times faster Best must be (default %(default)s)")
+    parser.add_argument("--json", metavar="FILE",
+                        help="also write the timings to FILE")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    print("python %s" % sys.version.split()[0])
+    results = run(sizes, args.repeat, args.idiom)
+    report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.check:
+        failures = check(results, args.margin)
+        for failure in failures:
+            print("FAIL " + failure)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
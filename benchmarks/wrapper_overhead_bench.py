@@ -0,0 +1,123 @@
+"""Call overhead of generic *args, **kwargs wrappers vs specialised ones.
+
+    python benchmarks/wrapper_overhead_bench.py
+
+Times string_stuff called positionally and with keywords, undecorated,
+through logger-shaped generic wrappers and through make_wrapper wrappers,
+and prints ns per call and the overhead each wrapper adds over the bare
+function. Log lines go to a handle that throws them away so the numbers are
+the wrapping, not the I/O.
+
+The saving make_wrapper gives any function is the difference between the
+two passthrough rows. The specialised logger is written by hand for
+string_stuff's parameters, make_wrapper can't generate its hook. It builds
+the same tuple and dict Logger formats and formats them the same way, so
+for a positional call it writes the same line and the logger rows only
+differ in how the arguments reach the formatting. Called with keywords it
+still logs all three as positionals.
+"""
+import argparse
+import contextlib
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+from presentations.loggers import Logger, logger  # noqa: E402
+from presentations.specialise import make_wrapper  # noqa: E402
+
+
+class NullHandle:
+    def write(self, line):
+        pass
+
+
+def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+    return prefix + message + suffix
+
+
+def passthrough(fn):
+    # The shape of inner_logger with nothing to log.
+    def inner(*args, **kwargs):
+        return fn(*args, **kwargs)
+    return inner
+
+
+def specialised_logger(file_handle):
+    # Logger(file_handle) built on make_wrapper for string_stuff: the hook
+    # gets the arguments by name and formats them exactly as Logger does.
+    write = file_handle.write
+
+    def decorate(fn):
+        name = fn.__name__
+
+        def log(message, prefix="Here goes:", suffix="... and that's it"):
+            write("%s(%s : %s)\n" % (name, (message, prefix, suffix), {}))
+        return make_wrapper(fn, before=log)
+    return decorate
+
+
+class LineHandle:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+
+def same_lines():
+    """Check the loggers being compared write the same thing."""
+    handles = [LineHandle() for _ in range(3)]
+    Logger(handles[0])(string_stuff)("my message", "S ", " E")
+    specialised_logger(handles[1])(string_stuff)("my message", "S ", " E")
+    with contextlib.redirect_stdout(handles[2]):
+        logger(string_stuff)("my message", "S ", " E")
+    texts = ["".join(handle.lines) for handle in handles]
+    if len(set(texts)) != 1:
+        raise AssertionError("loggers disagree: %r" % texts)
+
+
+VARIANTS = [
+    ("bare function", string_stuff),
+    ("generic passthrough", passthrough(string_stuff)),
+    ("specialised passthrough", make_wrapper(string_stuff)),
+    ("logger", logger(string_stuff)),
+    ("Logger", Logger(NullHandle())(string_stuff)),
+    ("specialised logger", specialised_logger(NullHandle())(string_stuff)),
+]
+
+CALLS = [
+    ("positional", lambda f: f("my message", "S ", " E")),
+    ("keywords", lambda f: f("my message", prefix="START", suffix="END")),
+]
+
+
+def best_ns(stmt, number, repeat):
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    same_lines()
+    print("python %s" % sys.version.split()[0])
+    for call_name, call in CALLS:
+        print("\n%s call (ns per call)" % call_name)
+        bare = None
+        for name, fn in VARIANTS:
+            # logger prints, send that to the NullHandle too.
+            with contextlib.redirect_stdout(NullHandle()):
+                ns = best_ns(lambda: call(fn), args.number, args.repeat)
+            if bare is None:
+                bare = ns
+            print("%-24s %8.1f  overhead %8.1f" % (name, ns, ns - bare))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Importable versions of the utilities from the presentation scripts.
+
+The presentation scripts (functions_and_decorators.py, tips_tricks.py) are
+meant to be read, not imported. The code in here is meant to be imported.
+
+Importing the package imports nothing else, each name below is loaded from
+its module the first time it's used:
+
+    from presentations import Logger    # imports presentations.loggers only
+
+Nothing in the package runs anything at import time, and NumPy, numba,
+asyncio, inspect and the multiprocessing machinery are only imported by the
+functions that need them. benchmarks/import_time_bench.py keeps an eye on
+it.
+"""
+from importlib import import_module
+
+# name -> module it lives in. specialise and external_sort are left out,
+# importing their modules would rebind the names to the modules.
+_EXPORTS = {
+    "logger": "loggers",
+    "Logger": "loggers",
+    "BufferedWriter": "buffered",
+    "CallLog": "records",
+    "RecordWriter": "records",
+    "read_records": "records",
+    "Sampler": "sampling",
+    "Memoize": "memoize",
+    "Accumulator": "accumulators",
+    "ShardedAccumulator": "accumulators",
+    "make_accumulator": "accumulators",
+    "make_adder": "closures",
+    "IndexedList": "indexed",
+    "Table": "columnar",
+    "join_to": "streaming",
+    "iter_join": "streaming",
+    "Pipeline": "pipeline",
+    "parallel_map": "parallel",
+    "make_wrapper": "specialise",
+    "Layer": "fusion",
+    "fuse": "fusion",
+    "shuffle": "shuffling",
+    "shuffled": "shuffling",
+    "reservoir_sample": "shuffling",
+    "shuffle_file": "shuffling",
+    "lift": "vectorise",
+    "Profiler": "profiling",
+    "Tracer": "tracing",
+    "RingLog": "ring",
+    "ProcessSink": "multiprocess",
+    "AllocationTracker": "allocations",
+    "MicroBatch": "batching",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(import_module("presentations." + module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
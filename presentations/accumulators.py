@@ -0,0 +1,161 @@
+"""Accumulators from functions_and_decorators.py.
+
+Accumulator is the callable class from the talk and make_accumulator the
+closure that fakes it with a list cell. Neither is safe to share between
+threads: "self.val += acc" is a read, an add and a write, and two threads can
+interleave them and lose an update.
+
+ShardedAccumulator is safe to share. Each thread adds into its own shard so
+there is no lock on the hot path, and value() adds the shards up:
+
+    events = ShardedAccumulator()
+    # in each worker thread
+    events(1)
+    # anywhere
+    events.value()
+
+Both accumulators also take a whole batch in one call with extend(), which
+adds a list, array.array or NumPy array without a Python call per value.
+NumPy is only imported if you hand it a NumPy array.
+"""
+import threading
+from itertools import accumulate
+
+
+def _is_numpy(values):
+    return type(values).__module__ == "numpy"
+
+
+def _batch_total(values, start):
+    if _is_numpy(values):
+        # .item() turns the NumPy scalar back into a python number. The sum
+        # itself is in the array's dtype so fixed size ints can wrap.
+        return start + values.sum().item()
+    return sum(values, start)
+
+
+def _prefix_sums(values, start):
+    # The running total after each value. A NumPy array for a NumPy array,
+    # otherwise a list: the totals of an array.array needn't fit its
+    # typecode, array("b", [100, 100]) sums to 200.
+    if _is_numpy(values):
+        import numpy
+        return numpy.cumsum(values) + start
+    sums = accumulate(values, initial=start)
+    next(sums)
+    return list(sums)
+
+
+class Accumulator:
+    __slots__ = ("val",)
+
+    def __init__(self, val=0):
+        self.val = val
+
+    def __call__(self, acc):
+        self.val += acc
+        return self.val
+
+    def extend(self, values, prefix=False):
+        """Add every value in a batch.
+
+        Returns the new total, or with prefix=True the total after each
+        value (a NumPy array for a NumPy array, a list otherwise).
+        """
+        if prefix:
+            sums = _prefix_sums(values, self.val)
+            if len(sums):
+                self.val = sums[-1].item() if _is_numpy(sums) else sums[-1]
+            return sums
+        self.val = _batch_total(values, self.val)
+        return self.val
+
+
+def make_accumulator():
+    val = [0]
+    def accum(n):
+        val[0] += n
+        return val[0]
+    return accum
+
+
+class _Shard:
+    __slots__ = ("val", "thread")
+
+    def __init__(self, thread):
+        self.val = 0
+        self.thread = thread
+
+
+class ShardedAccumulator:
+    """Accumulator that can be called from many threads at once.
+
+    Calling it doesn't return the running total, that would mean reading
+    every shard on every call. Use value() when you need the total.
+
+    value() is exact in that no addition is ever lost: it includes every
+    call that returned before value() started, and none or all of each call
+    racing with it. Shards of threads that have exited are folded into a
+    single total so thread churn doesn't grow the shard list.
+    """
+    __slots__ = ("_local", "_shards", "_lock", "_retired", "_offset")
+
+    def __init__(self, val=0):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._retired = val
+        self._offset = 0
+
+    def _new_shard(self):
+        shard = self._local.shard = _Shard(threading.current_thread())
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def __call__(self, acc):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        # Only this thread ever writes to its shard, no lock needed.
+        shard.val += acc
+
+    add = __call__
+
+    def extend(self, values):
+        """Add every value in a batch into this thread's shard."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.val = _batch_total(values, shard.val)
+
+    def _total(self):
+        # Caller holds the lock.
+        live = []
+        total = self._retired
+        for shard in self._shards:
+            total += shard.val
+            if shard.thread.is_alive():
+                live.append(shard)
+            else:
+                self._retired += shard.val
+        self._shards = live
+        return total
+
+    def value(self):
+        with self._lock:
+            return self._total() - self._offset
+
+    def reset(self):
+        """Start counting from zero again.
+
+        Shards belong to their threads so they aren't cleared, the current
+        total is remembered and subtracted instead.
+        """
+        with self._lock:
+            self._offset = self._total()
+
+    def __repr__(self):
+        return "<ShardedAccumulator %r>" % (self.value(),)
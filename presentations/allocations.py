@@ -0,0 +1,186 @@
+"""Find the functions that allocate.
+
+Repeated += on a string, append loops and tuple([...]) are all allocation
+problems, and AllocationTracker finds them at runtime. It is a decorator
+class like Logger, built on tracemalloc:
+
+    allocations = AllocationTracker(every=10)
+
+    @allocations
+    def join_them(cpd_lst):
+        cpds = ""
+        for cpd in cpd_lst:
+            cpds += ", " + cpd
+        return cpds
+
+    ...
+    allocations.report(stdout)
+
+For each sampled call it measures:
+    allocated  the most memory the call had allocated at once (the peak
+               traced memory during the call, minus what was traced when it
+               started)
+    retained   memory still allocated when the call returned
+    blocks     memory blocks still allocated when the call returned, only
+               with count_blocks=True because it takes a tracemalloc
+               snapshot before and after the call, which is slow
+
+and adds them up per function and per call site (the file and line the
+decorated function was called from).
+
+tracemalloc itself slows every allocation down, and the numbers are process
+wide so allocations made by other threads during a call are counted too.
+There is only one peak to reset for every call in flight, in any thread, so
+the peak so far is handed to each of them before it is reset.
+every, fraction and per_second sample calls the same way the loggers do
+(see presentations.sampling), unsampled calls cost a sampler call.
+tracemalloc is started on the first tracked call if it isn't already
+running, stop() stops it again if we started it.
+"""
+import sys
+import threading
+import tracemalloc
+from functools import wraps
+from itertools import count
+
+from presentations.sampling import make_sampler
+
+_FIELDS = ("calls", "allocated", "retained", "blocks", "max_allocated")
+
+# call id -> peak so far, for the tracked calls of every tracker in flight.
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_call_ids = count()
+
+
+class _Totals:
+    __slots__ = _FIELDS
+
+    def __init__(self):
+        self.calls = self.allocated = self.retained = self.blocks = 0
+        self.max_allocated = 0
+
+    def add(self, allocated, retained, blocks):
+        self.calls += 1
+        self.allocated += allocated
+        self.retained += retained
+        self.blocks += blocks
+        if allocated > self.max_allocated:
+            self.max_allocated = allocated
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in _FIELDS}
+
+
+def _block_count(snapshot):
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def _enter():
+    # -> (call id, traced memory at the start) for a new call in flight.
+    with _in_flight_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        for call_id, call_peak in _in_flight.items():
+            if peak > call_peak:
+                _in_flight[call_id] = peak
+        call_id = next(_call_ids)
+        _in_flight[call_id] = 0
+        tracemalloc.reset_peak()
+        return call_id, tracemalloc.get_traced_memory()[0]
+
+
+def _exit(call_id):
+    # -> (traced memory now, peak since the call started)
+    with _in_flight_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        return current, max(_in_flight.pop(call_id), peak)
+
+
+class AllocationTracker:
+    def __init__(self, every=None, fraction=None, per_second=None,
+                 count_blocks=False, nframes=1):
+        self.sampling = (every, fraction, per_second)
+        self.count_blocks = count_blocks
+        self.nframes = nframes
+        self.functions = {}     # name -> _Totals
+        self.call_sites = {}    # (name, "file:line") -> _Totals
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframes)
+            self._started = True
+
+    def stop(self):
+        """Stop tracemalloc if this tracker started it."""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def __call__(self, fn):
+        name = fn.__qualname__
+        sampler = make_sampler(*self.sampling)
+        measure = self._measure
+
+        @wraps(fn)
+        def inner_allocations(*args, **kwargs):
+            if sampler is not None and not sampler():
+                return fn(*args, **kwargs)
+            caller = sys._getframe(1)
+            site = "%s:%d" % (caller.f_code.co_filename, caller.f_lineno)
+            del caller
+            return measure(name, site, fn, args, kwargs)
+        return inner_allocations
+
+    def _measure(self, name, site, fn, args, kwargs):
+        self._start()
+        before_blocks = 0
+        if self.count_blocks:
+            before_blocks = _block_count(tracemalloc.take_snapshot())
+        call_id, start = _enter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            current, peak = _exit(call_id)
+            blocks = 0
+            if self.count_blocks:
+                blocks = _block_count(tracemalloc.take_snapshot()) \
+                    - before_blocks
+            self._add(name, site, max(peak - start, 0), current - start,
+                      blocks)
+
+    def _add(self, name, site, allocated, retained, blocks):
+        with self._lock:
+            totals = self.functions.get(name)
+            if totals is None:
+                totals = self.functions[name] = _Totals()
+            totals.add(allocated, retained, blocks)
+            totals = self.call_sites.get((name, site))
+            if totals is None:
+                totals = self.call_sites[(name, site)] = _Totals()
+            totals.add(allocated, retained, blocks)
+
+    def top(self, n=10, by="allocated", call_sites=False):
+        """[(name or (name, site), totals dict)] for the n biggest."""
+        if by not in _FIELDS:
+            raise ValueError("by must be one of %s" % ", ".join(_FIELDS))
+        with self._lock:
+            items = list((self.call_sites if call_sites
+                          else self.functions).items())
+        items.sort(key=lambda item: getattr(item[1], by), reverse=True)
+        return [(key, totals.as_dict()) for key, totals in items[:n]]
+
+    def report(self, file_handle, n=10, by="allocated"):
+        file_handle.write("%-40s %8s %14s %14s %10s\n"
+                          % ("function", "calls", "allocated", "retained",
+                             "blocks"))
+        for name, totals in self.top(n, by):
+            file_handle.write("%-40s %8d %14d %14d %10d\n"
+                              % (name, totals["calls"], totals["allocated"],
+                                 totals["retained"], totals["blocks"]))
+
+    def clear(self):
+        with self._lock:
+            self.functions.clear()
+            self.call_sites.clear()
@@ -0,0 +1,143 @@
+"""Turn many single calls into a few batched ones.
+
+When a backend can do a whole batch for about the price of one item,
+calling it once per item throws that away. MicroBatch is a decorator class
+for a function that takes a list of items and returns a list of results.
+The decorated function is called with one item at a time, the calls are
+queued, and the batch function is run on a background thread once max_size
+items are waiting or the oldest has waited max_latency seconds:
+
+    @MicroBatch(max_size=100, max_latency=0.005)
+    def string_stuff(messages):
+        return ["Here goes:" + message + "... and that's it"
+                for message in messages]
+
+    string_stuff("my message")             # blocks until its batch has run
+    string_stuff.submit("my message")      # a concurrent.futures.Future
+    await string_stuff.acall("my message") # from a coroutine
+
+Results are returned in the same order as the items. To fail one item
+without failing the batch, put an exception instance in its place in the
+results, it's raised to that caller alone. If the batch function raises,
+every caller in the batch gets the exception.
+
+The background thread is started by the first call, and close() (which is
+also run at exit) finishes any queued calls and stops it.
+"""
+import atexit
+import queue
+import threading
+from functools import wraps
+from time import monotonic
+
+_STOP = object()
+
+
+def _run_batch(batch_fn, batch):
+    items = [item for item, _ in batch]
+    futures = [future for _, future in batch]
+    try:
+        results = batch_fn(items)
+        if len(results) != len(items):
+            raise ValueError("%s returned %d results for %d items"
+                             % (batch_fn.__name__, len(results), len(items)))
+    except BaseException as e:
+        for future in futures:
+            future.set_exception(e)
+        return
+    for future, result in zip(futures, results):
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def _worker(batch_fn, calls, max_size, max_latency):
+    get = calls.get
+    while True:
+        first = get()
+        if first is _STOP:
+            return
+        batch = [first]
+        deadline = monotonic() + max_latency
+        stopping = False
+        while len(batch) < max_size:
+            timeout = deadline - monotonic()
+            try:
+                call = get(timeout=timeout) if timeout > 0 else get(False)
+            except queue.Empty:
+                break
+            if call is _STOP:
+                stopping = True
+                break
+            batch.append(call)
+        _run_batch(batch_fn, batch)
+        if stopping:
+            # submit() never queues anything behind the stop.
+            return
+
+
+class MicroBatch:
+    def __init__(self, max_size=64, max_latency=0.01):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        if max_latency < 0:
+            raise ValueError("max_latency must not be negative")
+        self.max_size = max_size
+        self.max_latency = max_latency
+
+    def __call__(self, batch_fn):
+        max_size, max_latency = self.max_size, self.max_latency
+        calls = queue.Queue()
+        lock = threading.Lock()
+        state = {"thread": None, "closed": False}
+
+        def start():
+            # Called with lock held.
+            thread = threading.Thread(
+                target=_worker, args=(batch_fn, calls, max_size, max_latency),
+                name="MicroBatch %s" % batch_fn.__name__, daemon=True)
+            thread.start()
+            state["thread"] = thread
+            atexit.register(close)
+
+        def submit(item):
+            # Imported here, concurrent.futures brings logging with it.
+            from concurrent.futures import Future
+            future = Future()
+            # The check and the put happen together so nothing can be
+            # queued behind close()'s stop, where nobody would run it.
+            with lock:
+                if state["closed"]:
+                    raise RuntimeError("%s has been closed"
+                                       % batch_fn.__name__)
+                if state["thread"] is None:
+                    start()
+                calls.put((item, future))
+            return future
+
+        @wraps(batch_fn)
+        def inner_batch(item):
+            return submit(item).result()
+
+        async def acall(item):
+            import asyncio
+            return await asyncio.wrap_future(submit(item))
+
+        def close():
+            with lock:
+                if state["closed"]:
+                    return
+                state["closed"] = True
+                thread = state["thread"]
+                if thread is not None:
+                    calls.put(_STOP)
+            if thread is not None:
+                atexit.unregister(close)
+                thread.join()
+
+        inner_batch.submit = submit
+        inner_batch.acall = acall
+        inner_batch.close = close
+        inner_batch.batch = batch_fn
+        return inner_batch
@@ -0,0 +1,158 @@
+"""A file-like wrapper that moves writes off the calling thread.
+
+Calling write() on a slow handle (a pipe, a network filesystem, a terminal)
+makes the caller wait for the syscall. BufferedWriter puts each record on a
+bounded queue instead and a background thread drains the queue into the real
+handle in batches:
+
+    out = BufferedWriter(open("calls.log", "w"), batch_size=1024)
+    out.write("string_stuff(('my message',) : {})\n")
+
+A batch is written when batch_size records are waiting or flush_interval
+seconds have passed since the last write, whichever comes first. Anything
+still queued is written when close() is called, and close() is registered
+with atexit so it also happens at interpreter exit.
+
+When the queue is full on_full decides what write() does:
+    "block" - wait for the writer thread to make room (nothing is lost)
+    "drop"  - throw the record away, only the dropped counter knows
+    "count" - throw the record away and write a line to the handle saying
+              how many records were dropped since the last batch
+"""
+import atexit
+import queue
+import threading
+from time import monotonic
+
+ON_FULL = ("block", "drop", "count")
+
+_STOP = object()
+
+
+class BufferedWriter:
+    def __init__(self, file_handle, max_records=10000, batch_size=512,
+                 flush_interval=0.5, on_full="block"):
+        if on_full not in ON_FULL:
+            raise ValueError("on_full must be one of %s, not %r"
+                             % (", ".join(ON_FULL), on_full))
+        if max_records < 1 or batch_size < 1:
+            raise ValueError("max_records and batch_size must be positive")
+        self.file_handle = file_handle
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_full = on_full
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self.closed = False
+        self._reported_drops = 0
+        self._binary = None   # until the first record says
+        self._drop_lock = threading.Lock()
+        self._queue = queue.Queue(max_records)
+        self._thread = threading.Thread(target=self._drain,
+                                        name="BufferedWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record):
+        if self.closed:
+            raise ValueError("write to closed BufferedWriter")
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if self.on_full == "block":
+                self._put(record)
+            else:
+                with self._drop_lock:
+                    self.dropped += 1
+
+    def _put(self, record):
+        # Wait for room, but give up once closed: nothing drains the queue
+        # after the writer thread has stopped.
+        while True:
+            try:
+                self._queue.put(record, timeout=0.1)
+                return
+            except queue.Full:
+                if self.closed:
+                    raise ValueError("write to closed BufferedWriter")
+
+    def flush(self):
+        """Block until everything written so far has reached the handle."""
+        if self.closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    async def aflush(self):
+        """flush() for coroutines, waits without blocking the event loop."""
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def close(self):
+        """Write out whatever is queued and stop the writer thread."""
+        if self.closed:
+            return
+        self.closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _drain(self):
+        get = self._queue.get
+        batch = []
+        deadline = monotonic() + self.flush_interval
+        while True:
+            timeout = deadline - monotonic()
+            try:
+                record = get(timeout=timeout) if timeout > 0 else get(False)
+            except queue.Empty:
+                record = None
+
+            if record is None or record is _STOP \
+                    or isinstance(record, threading.Event):
+                self._write_batch(batch)
+                batch = []
+                deadline = monotonic() + self.flush_interval
+                if record is _STOP:
+                    return
+                if record is not None:
+                    record.set()
+                continue
+
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+                deadline = monotonic() + self.flush_interval
+
+    def _write_batch(self, batch):
+        # A text line in the middle of binary records would corrupt them, so
+        # drops are only reported once the records are known to be text.
+        if batch and self._binary is None:
+            self._binary = isinstance(batch[0], bytes)
+        if self.on_full == "count" and self.dropped != self._reported_drops \
+                and self._binary is False:
+            dropped = self.dropped
+            batch.append("BufferedWriter: dropped %d records\n"
+                         % (dropped - self._reported_drops))
+            self._reported_drops = dropped
+        if not batch:
+            return
+        try:
+            # Records can be str or bytes, join with an empty one of those.
+            self.file_handle.write(batch[0][:0].join(batch))
+            if hasattr(self.file_handle, "flush"):
+                self.file_handle.flush()
+        except Exception:
+            # There's no caller to hand this to, the records are lost.
+            self.errors += 1
+        else:
+            self.written += len(batch)
@@ -0,0 +1,7 @@
+"""Closures from functions_and_decorators.py."""
+
+
+def make_adder(x):
+    def adder(n):
+        return n + x
+    return adder
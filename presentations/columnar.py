@@ -0,0 +1,166 @@
+"""A table stored a column at a time.
+
+The python_group example is a list of dicts, one per row, sorted with
+sort(key=lambda python: python["lname"]). Every row pays for a whole dict
+and every sort calls a lambda and does a dict lookup per row. Table keeps one
+list per field instead, and "status", which only one row has, is kept in a
+dict from row number to value rather than as a column of Nones:
+
+    python_group = Table.from_rows([
+        {"fname": "John", "lname": "Clease"},
+        {"fname": "Graham", "lname": "Chapman", "status": "deceased"},
+        ...])
+
+    for python in python_group.sorted("fname", "lname"):
+        print(python["fname"], python["lname"], python.get("status"))
+
+Rows come back as RowViews, read only dict-like views into the columns.
+
+order() returns the row numbers in sorted order. It is cached per key until
+the table changes, so sorting the same table by the same keys again is free.
+Prefix a field with "-" to sort it descending. Sorting is stable and rows
+missing a sparse field sort first, or last when that field is descending.
+
+Pass typecodes={"age": "i"} to store a column as an array.array.
+"""
+from array import array
+from collections.abc import Mapping
+
+
+class RowView(Mapping):
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field):
+        table = self._table
+        column = table._dense.get(field)
+        if column is not None:
+            return column[self._row]
+        return table._sparse[field][self._row]
+
+    def __iter__(self):
+        table = self._table
+        yield from table._dense
+        for field, column in table._sparse.items():
+            if self._row in column:
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Table:
+    def __init__(self, fields, sparse=(), typecodes=None):
+        typecodes = typecodes or {}
+        self._dense = {field: array(typecodes[field]) if field in typecodes
+                       else [] for field in fields}
+        self._sparse = {field: {} for field in sparse}
+        self._length = 0
+        self._orders = {}
+
+    @classmethod
+    def from_rows(cls, rows, typecodes=None):
+        """Fields every row has are stored densely, the rest sparsely."""
+        rows = list(rows)
+        counts = {}
+        for row in rows:
+            for field in row:
+                counts[field] = counts.get(field, 0) + 1
+        dense = [f for f, n in counts.items() if n == len(rows)]
+        sparse = [f for f, n in counts.items() if n < len(rows)]
+        table = cls(dense, sparse, typecodes)
+        table.extend(rows)
+        return table
+
+    @property
+    def fields(self):
+        return list(self._dense) + list(self._sparse)
+
+    def column(self, field):
+        """The column for a dense field, or {row: value} for a sparse one."""
+        if field in self._dense:
+            return self._dense[field]
+        return self._sparse[field]
+
+    def append(self, row):
+        missing = [f for f in self._dense if f not in row]
+        if missing:
+            raise KeyError("row is missing %s" % ", ".join(missing))
+        extra = [f for f in row
+                 if f not in self._dense and f not in self._sparse]
+        if extra:
+            raise KeyError("table has no field %s" % ", ".join(extra))
+        i = self._length
+        appended = []
+        try:
+            for field, column in self._dense.items():
+                column.append(row[field])
+                appended.append(column)
+        except (TypeError, OverflowError, ValueError):
+            # An array column rejected the value, take the row back out of
+            # the columns that already took it so they stay the same length.
+            for column in appended:
+                column.pop()
+            raise
+        for field, column in self._sparse.items():
+            if field in row:
+                column[i] = row[field]
+        self._length = i + 1
+        self._orders.clear()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError("row index out of range")
+        return RowView(self, row)
+
+    def __iter__(self):
+        for row in range(self._length):
+            yield RowView(self, row)
+
+    def _sort_key(self, field):
+        column = self._dense.get(field)
+        if column is not None:
+            # A bound method is a C level key, no lambda per row.
+            return column.__getitem__
+        column = self._sparse[field]
+        return lambda row: (row in column, column.get(row))
+
+    def order(self, *fields):
+        """Row numbers sorted by fields, cached until the table changes."""
+        permutation = self._orders.get(fields)
+        if permutation is None:
+            rows = list(range(self._length))
+            # Stable sorts from the last key to the first give multi-key
+            # order, the same trick as sorting python_group twice.
+            for field in reversed(fields):
+                reverse = field.startswith("-")
+                rows.sort(key=self._sort_key(field.lstrip("-")),
+                          reverse=reverse)
+            permutation = self._orders[fields] = array("q", rows)
+        return permutation
+
+    def sorted(self, *fields):
+        """RowViews in the order given by order(*fields)."""
+        for row in self.order(*fields):
+            yield RowView(self, row)
+
+    def to_dicts(self):
+        return [dict(row) for row in self]
+
+    def __repr__(self):
+        return "<Table %d rows: %s>" % (self._length, ", ".join(self.fields))
@@ -0,0 +1,119 @@
+"""Sort records that don't fit in memory.
+
+python_group.sort(key=lambda python: python["lname"]) needs every record in
+memory at once. external_sort takes the same key function but any iterator
+of records, and gives them back sorted as a generator:
+
+    by_lname = external_sort(read_pythons(), key=lambda python: python["lname"])
+    for python in external_sort(by_lname, key=lambda python: python["fname"]):
+        ...
+
+It sorts run_size records at a time in memory, spills each sorted run to a
+temporary file and then merges the runs. The sort is stable, so sorting by
+fname after lname orders by fname and then lname, the same as the two sort
+calls in the talk. If everything fits in one run nothing touches the disk.
+
+No merge reads more than fan_in runs at once. Whenever fan_in runs of the
+same size have piled up they are merged into one bigger run, so a billion
+records in runs of 100000 are 10000 runs but never more than a couple of
+hundred open files, at the cost of writing each record about three times
+rather than once.
+
+Runs are written as pickled (key, record) blocks so keys aren't computed
+twice, records and keys have to be picklable.
+"""
+import heapq
+from itertools import islice
+from operator import itemgetter
+
+_BLOCK = 1024
+
+
+def _write_run(run, tmpdir):
+    # Only imported once a run has to be spilled.
+    import pickle
+    import tempfile
+    f = tempfile.TemporaryFile(dir=tmpdir)
+    dump = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL).dump
+    run = iter(run)
+    while True:
+        block = list(islice(run, _BLOCK))
+        if not block:
+            break
+        dump(block)
+    f.seek(0)
+    return f
+
+
+def _read_run(f):
+    import pickle
+    load = pickle.Unpickler(f).load
+    while True:
+        try:
+            block = load()
+        except EOFError:
+            return
+        yield from block
+
+
+def _merge(runs, reverse):
+    # heapq.merge takes from the earliest run on equal keys, which keeps
+    # the merge stable as long as runs are in the order they were made.
+    return heapq.merge(*(_read_run(f) for f in runs),
+                       key=itemgetter(0), reverse=reverse)
+
+
+def _merge_runs(runs, reverse, tmpdir):
+    merged = _write_run(_merge(runs, reverse), tmpdir)
+    for f in runs:
+        f.close()
+    return merged
+
+
+def external_sort(records, key=None, reverse=False, run_size=100000,
+                  tmpdir=None, fan_in=64):
+    """Generator of records sorted by key, see the module docstring."""
+    if run_size < 1:
+        raise ValueError("run_size must be positive")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    if key is None:
+        key = _identity
+    it = iter(records)
+    runs = []
+    # How many merges went into each run, never increasing along runs.
+    levels = []
+    try:
+        while True:
+            chunk = list(islice(it, run_size))
+            if not chunk:
+                break
+            run = [(key(record), record) for record in chunk]
+            # Sort on the key alone: comparing the pairs would fall back to
+            # comparing records on ties, which breaks stability (and fails
+            # for dicts).
+            run.sort(key=itemgetter(0), reverse=reverse)
+            if not runs and len(chunk) < run_size:
+                # Everything fitted in memory.
+                yield from map(itemgetter(1), run)
+                return
+            runs.append(_write_run(run, tmpdir))
+            levels.append(0)
+            del run, chunk
+            # Carry like a base fan_in counter: the newest fan_in runs of one
+            # level become a run of the next. Only ever the newest runs, so
+            # every merge is of consecutive runs.
+            while len(runs) >= fan_in and levels[-fan_in] == levels[-1]:
+                runs[-fan_in:] = [_merge_runs(runs[-fan_in:], reverse, tmpdir)]
+                levels[-fan_in:] = [levels[-1] + 1]
+
+        while len(runs) > fan_in:
+            runs[-fan_in:] = [_merge_runs(runs[-fan_in:], reverse, tmpdir)]
+        yield from map(itemgetter(1), _merge(runs, reverse))
+    finally:
+        for f in runs:
+            f.close()
+
+
+def _identity(record):
+    return record
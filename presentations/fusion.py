@@ -0,0 +1,157 @@
+"""Several decorators, one wrapper.
+
+Stack @fn_plus_one, @logger and @Logger(stdout) and every call goes through
+three wrapper frames, each packing and unpacking the arguments again.
+Decorators written as Layers instead declare what they do before and after
+the call, and however many are stacked they are fused into a single wrapper
+that packs the arguments once:
+
+    class Counter(Layer):
+        def __init__(self):
+            self.calls = 0
+        def before(self, fn, args, kwargs):
+            self.calls += 1
+
+    class PlusOne(Layer):
+        def after(self, fn, result):
+            return result + 1
+
+    @LoggerLayer(stdout)
+    @Counter()
+    @PlusOne()
+    def one(): return 1
+
+    fused_layers(one)
+    # >>> [<LoggerLayer before>, <Counter before>, <PlusOne after>]
+
+or all at once with @fuse(LoggerLayer(stdout), Counter(), PlusOne()).
+
+A Layer can define:
+    before(fn, args, kwargs)      called before fn, outermost layer first
+    after(fn, result) -> result   called after fn, innermost layer first
+    around(call, fn, args, kwargs) -> result
+                                  must call call(*args, **kwargs) itself
+
+before and after cost no extra frames. Each around layer still needs one
+because it has to be handed something to call, and the layers inside it
+get a wrapper of their own: hooks run in the same order, and as many
+times, as they would with the layers stacked one by one.
+
+Stacking only fuses when a Layer is applied directly to another fused
+wrapper, any other decorator in between ends the fusion.
+"""
+from functools import update_wrapper
+
+
+class Layer:
+    def before(self, fn, args, kwargs):
+        pass
+
+    def after(self, fn, result):
+        return result
+
+    def around(self, call, fn, args, kwargs):
+        return call(*args, **kwargs)
+
+    def hooks(self):
+        """Which of before, after and around this layer overrides."""
+        cls = type(self)
+        return [name for name in ("before", "after", "around")
+                if getattr(cls, name) is not getattr(Layer, name)]
+
+    def __call__(self, fn):
+        return fuse(self)(fn)
+
+    def __repr__(self):
+        return "<%s %s>" % (type(self).__name__, " ".join(self.hooks()))
+
+
+class LoggerLayer(Layer):
+    """Logger(file_handle) as a Layer."""
+    def __init__(self, file_handle):
+        self.file_handle = file_handle
+
+    def before(self, fn, args, kwargs):
+        self.file_handle.write("%s(%s : %s)\n" % (fn.__name__, args, kwargs))
+
+
+def _around(layer, call, fn):
+    around = layer.around
+
+    def inner_around(*args, **kwargs):
+        return around(call, fn, args, kwargs)
+    return inner_around
+
+
+def _compile(fn, layers, call):
+    # One function running the before and after hooks of layers around call.
+    namespace = {"fn": fn, "call": call}
+    befores, afters = [], []
+    for i, layer in enumerate(layers):
+        hooks = layer.hooks()
+        if "before" in hooks:
+            namespace["b%d" % i] = layer.before
+            befores.append("    b%d(fn, args, kwargs)" % i)
+        if "after" in hooks:
+            namespace["a%d" % i] = layer.after
+            afters.insert(0, "    result = a%d(fn, result)" % i)
+
+    # Written out as source so there's no loop over the layers per call.
+    lines = ["def fused(*args, **kwargs):"]
+    lines += befores
+    lines.append("    result = call(*args, **kwargs)")
+    lines += afters
+    lines.append("    return result")
+    exec("\n".join(lines) + "\n", namespace)
+    return namespace["fused"]
+
+
+def _build(fn, layers):
+    # Cut after every around layer. Each piece's hooks run outside the
+    # around that ends it, the next piece's inside.
+    pieces = []
+    start = 0
+    for i, layer in enumerate(layers):
+        if "around" in layer.hooks():
+            pieces.append(layers[start:i + 1])
+            start = i + 1
+    pieces.append(layers[start:])
+
+    call = fn
+    for n, piece in enumerate(reversed(pieces)):
+        if piece and "around" in piece[-1].hooks():
+            call = _around(piece[-1], call, fn)
+        hooks = [hook for layer in piece for hook in layer.hooks()]
+        if "before" in hooks or "after" in hooks or n == len(pieces) - 1:
+            call = _compile(fn, piece, call)
+
+    fused = update_wrapper(call, fn)
+    fused.__fusion__ = (fused, fn, tuple(layers))
+    return fused
+
+
+def _fusion(fn):
+    # -> (unwrapped fn, layers) if fn is a fused wrapper, else None.
+    # update_wrapper copies __dict__, so any decorator wrapped around a
+    # fused wrapper has __fusion__ too, it only counts on the one it names.
+    fusion = getattr(fn, "__fusion__", None)
+    if fusion is None or fusion[0] is not fn:
+        return None
+    return fusion[1:]
+
+
+def fuse(*layers):
+    """Decorator applying layers (outermost first) as one wrapper."""
+    def decorate(fn):
+        fusion = _fusion(fn)
+        if fusion is not None:
+            inner, inner_layers = fusion
+            return _build(inner, list(layers) + list(inner_layers))
+        return _build(fn, list(layers))
+    return decorate
+
+
+def fused_layers(fn):
+    """The layers fused into fn, outermost first."""
+    fusion = _fusion(fn)
+    return list(fusion[1]) if fusion is not None else []
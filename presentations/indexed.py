@@ -0,0 +1,199 @@
+"""A list that knows where its values are.
+
+"1 in list1" is the right way to spell a membership test, but on a list it
+still looks at every element. IndexedList keeps a dict from each value to
+the positions it's at, so in, index(), count() and positions() are dict
+lookups while it still behaves like a list:
+
+    list1 = IndexedList(['a', 'b', 'c', 'a'])
+    'a' in list1
+    # >>> True
+    list1.positions('a')
+    # >>> (0, 3)
+
+append(), extend() and changing or popping the last element keep the index
+up to date as they go. Anything that moves elements around (insert or delete
+in the middle, slice assignment, sort, reverse) throws the index away and it
+is rebuilt, once, by the next lookup. That suits lists that are searched far
+more often than they are reshuffled.
+
+Unhashable values can be stored but aren't indexed, looking one up falls
+back to scanning the list.
+"""
+import sys
+from bisect import bisect_left, insort
+from collections.abc import MutableSequence
+
+
+def _hashable(value):
+    # isinstance(value, Hashable) is True for a tuple holding a list.
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class IndexedList(MutableSequence):
+    def __init__(self, iterable=()):
+        self._items = list(iterable)
+        self._index = None
+
+    def _positions(self):
+        index = self._index
+        if index is None:
+            index = {}
+            for i, value in enumerate(self._items):
+                if _hashable(value):
+                    index.setdefault(value, []).append(i)
+            self._index = index
+        return index
+
+    def _add(self, value, i):
+        if self._index is not None and _hashable(value):
+            positions = self._index.setdefault(value, [])
+            if not positions or positions[-1] < i:
+                positions.append(i)
+            else:
+                insort(positions, i)
+
+    def _discard(self, value, i):
+        if self._index is not None and _hashable(value):
+            positions = self._index[value]
+            del positions[bisect_left(positions, i)]
+            if not positions:
+                del self._index[value]
+
+    # Lookups
+
+    def __contains__(self, value):
+        if not _hashable(value):
+            return value in self._items
+        return value in self._positions()
+
+    def positions(self, value):
+        """Every position value is at, in order."""
+        if not _hashable(value):
+            return tuple(i for i, v in enumerate(self._items) if v == value)
+        return tuple(self._positions().get(value, ()))
+
+    def index(self, value, start=0, stop=None):
+        if not _hashable(value):
+            return self._items.index(value, start, len(self) if stop is None else stop)
+        length = len(self._items)
+        start = max(start + length, 0) if start < 0 else start
+        stop = length if stop is None else (
+            max(stop + length, 0) if stop < 0 else stop)
+        positions = self._positions().get(value, ())
+        i = bisect_left(positions, start)
+        if i < len(positions) and positions[i] < stop:
+            return positions[i]
+        raise ValueError("%r is not in list" % (value,))
+
+    def count(self, value):
+        if not _hashable(value):
+            return self._items.count(value)
+        return len(self._positions().get(value, ()))
+
+    def index_nbytes(self):
+        """Memory used by the index on top of the list, in bytes.
+
+        Counts the dict and the position lists, not the values themselves
+        which are shared with the list.
+        """
+        index = self._positions()
+        total = sys.getsizeof(index)
+        for positions in index.values():
+            total += sys.getsizeof(positions)
+            # ints below 257 are cached by CPython and cost nothing extra
+            total += sum(sys.getsizeof(i) for i in positions if i > 256)
+        return total
+
+    # Sequence
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return IndexedList(self._items[i])
+        return self._items[i]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, IndexedList):
+            other = other._items
+        return self._items == other
+
+    def __repr__(self):
+        return "IndexedList(%r)" % (self._items,)
+
+    # Mutation
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            self._items[i] = value
+            self._index = None
+            return
+        if i < 0:
+            i += len(self._items)
+        old = self._items[i]
+        self._items[i] = value
+        self._discard(old, i)
+        self._add(value, i)
+
+    def __delitem__(self, i):
+        if not isinstance(i, slice) and i in (-1, len(self._items) - 1):
+            self.pop()
+            return
+        del self._items[i]
+        self._index = None
+
+    def insert(self, i, value):
+        if i >= len(self._items):
+            self.append(value)
+            return
+        self._items.insert(i, value)
+        self._index = None
+
+    def append(self, value):
+        self._items.append(value)
+        self._add(value, len(self._items) - 1)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def pop(self, i=-1):
+        length = len(self._items)
+        if i in (-1, length - 1):
+            value = self._items.pop()
+            self._discard(value, length - 1)
+            return value
+        value = self._items.pop(i)
+        self._index = None
+        return value
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def clear(self):
+        self._items.clear()
+        self._index = None
+
+    def reverse(self):
+        self._items.reverse()
+        self._index = None
+
+    def sort(self, *, key=None, reverse=False):
+        self._items.sort(key=key, reverse=reverse)
+        self._index = None
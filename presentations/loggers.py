@@ -0,0 +1,229 @@
+"""The logger decorators from functions_and_decorators.py.
+
+logger is the simple decorator function, Logger is the decorator class that
+takes a file handle at decoration time:
+
+    @Logger(stdout)
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+Both can defer formatting to whoever reads the log (see
+presentations.records) and only log some of the calls (see
+presentations.sampling):
+
+    @Logger(stdout, every=1000)
+    def string_stuff(...):
+
+The Sampler deciding which calls are logged is the .sampler attribute of
+the decorated function.
+
+async def functions and async generators (or a functools.partial of one, or
+an object whose __call__ is one) are wrapped as what they are, the record is
+made when the awaited call (or the iteration) finishes and text lines end
+with how long that took in seconds:
+
+    string_stuff(('my message',) : {}) 0.001203s
+
+A blocking write on the event loop thread would stall every other task, so
+async functions write through their own BufferedWriter in front of the
+handle that drops rather than blocks when full (on_full="count"), unless
+buffered=True already wrapped it. Sync functions decorated by the same
+Logger still write to the handle itself and lose nothing. A deferred
+RecordWriter gets the same for its records, names are still written
+straight to its handle. A CallLog is in memory and is used as is. Values
+sent into a wrapped async generator with asend() are not passed on.
+"""
+from functools import partial, wraps
+from sys import stdout
+from time import perf_counter
+
+from presentations.buffered import BufferedWriter
+from presentations.records import RecordWriter
+from presentations.sampling import make_sampler
+
+# The code flags inspect.iscoroutinefunction and isasyncgenfunction test,
+# checked directly because importing inspect would double our import time.
+_CO_COROUTINE = 0x80
+_CO_ASYNC_GENERATOR = 0x200
+
+
+def _has_flag(fn, flag):
+    while isinstance(fn, partial):
+        fn = fn.func
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        # A callable object is async if its __call__ is.
+        code = getattr(getattr(type(fn), "__call__", None), "__code__", None)
+    return code is not None and bool(code.co_flags & flag)
+
+
+def _named(fn):
+    # What fn's calls are logged as: a partial goes by its function's name,
+    # a callable object by its class's.
+    while isinstance(fn, partial):
+        fn = fn.func
+    return fn if hasattr(fn, "__name__") else type(fn)
+
+
+def _wrap(fn, emit, sampler):
+    # emit(args, kwargs) logs a call, it is only called for kept calls so a
+    # suppressed call never formats its arguments.
+    if _has_flag(fn, _CO_COROUTINE):
+        @wraps(fn)
+        async def inner_logger(*args, **kwargs):
+            keep = sampler is None or sampler()
+            start = perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                if keep:
+                    emit(args, kwargs, perf_counter() - start)
+    elif _has_flag(fn, _CO_ASYNC_GENERATOR):
+        @wraps(fn)
+        async def inner_logger(*args, **kwargs):
+            keep = sampler is None or sampler()
+            start = perf_counter()
+            try:
+                async for item in fn(*args, **kwargs):
+                    yield item
+            finally:
+                if keep:
+                    emit(args, kwargs, perf_counter() - start)
+    elif sampler is None:
+        @wraps(fn)
+        def inner_logger(*args, **kwargs):
+            emit(args, kwargs)
+            return fn(*args, **kwargs)
+    else:
+        @wraps(fn)
+        def inner_logger(*args, **kwargs):
+            if sampler():
+                emit(args, kwargs)
+            return fn(*args, **kwargs)
+    inner_logger.sampler = sampler
+    return inner_logger
+
+
+def _is_async(fn):
+    return _has_flag(fn, _CO_COROUTINE | _CO_ASYNC_GENERATOR)
+
+
+def _format(name, args, kwargs, elapsed):
+    if elapsed is None:
+        return "%s(%s : %s)" % (name, args, kwargs)
+    return "%s(%s : %s) %.6fs" % (name, args, kwargs, elapsed)
+
+
+def _emitter(fn, sink, deferred):
+    # Deferred records have no room for the elapsed time, it's dropped.
+    if deferred:
+        record = sink.record
+        fn_id = sink.register(_named(fn))
+        return lambda args, kwargs, elapsed=None: record(fn_id, args, kwargs)
+    write = sink.write
+    name = _named(fn).__name__
+    return lambda args, kwargs, elapsed=None: write(
+        _format(name, args, kwargs, elapsed) + "\n")
+
+
+def _non_blocking(file_handle):
+    if isinstance(file_handle, BufferedWriter):
+        return file_handle
+    return BufferedWriter(file_handle, on_full="count")
+
+
+def _async_sink(sink, deferred):
+    # A sink for async functions in front of sink, which is left as it is
+    # for the sync functions using it.
+    if not deferred:
+        return _non_blocking(sink)
+    if isinstance(sink, RecordWriter):
+        return RecordWriter(_non_blocking(sink.file_handle), names=sink)
+    return sink
+
+
+_async_stdout = None
+_async_sinks = None
+
+
+def _shared_async_sink(log):
+    # logger(log=...) has no object of its own to keep the async sink on like
+    # Logger does, so it's kept per log here and shared by every async
+    # function logging to it.
+    global _async_sinks
+    if _async_sinks is None:
+        from weakref import WeakKeyDictionary
+        _async_sinks = WeakKeyDictionary()
+    sink = _async_sinks.get(log)
+    if sink is None:
+        sink = _async_sinks[log] = _async_sink(log, deferred=True)
+    return sink
+
+
+def _print_async(line):
+    # The async flavour of print for logger, created when first needed.
+    global _async_stdout
+    if _async_stdout is None:
+        _async_stdout = _non_blocking(stdout)
+    _async_stdout.write(line + "\n")
+
+
+def logger(fn=None, log=None, every=None, fraction=None, per_second=None):
+    """Print each call to fn.
+
+    Use it bare (@logger) to print, or give it a CallLog or RecordWriter
+    (@logger(log=calls)) to store the call and format it later. every,
+    fraction and per_second choose which calls get logged.
+    """
+    if fn is None:
+        return lambda fn: logger(fn, log, every, fraction, per_second)
+    if log is not None:
+        if _is_async(fn):
+            log = _shared_async_sink(log)
+        emit = _emitter(fn, log, deferred=True)
+    else:
+        out = _print_async if _is_async(fn) else print
+        name = _named(fn).__name__
+        emit = lambda args, kwargs, elapsed=None: out(
+            _format(name, args, kwargs, elapsed))
+    return _wrap(fn, emit, make_sampler(every, fraction, per_second))
+
+
+class Logger:
+    """Decorator class that writes a line per call to file_handle.
+
+    With buffered=True the handle is wrapped in a BufferedWriter so the
+    decorated function only pays for a queue put, the write itself happens on
+    a background thread. Any extra keyword arguments are passed on to the
+    BufferedWriter (max_records, batch_size, flush_interval, on_full).
+
+    With deferred=True no text is formatted at call time. file_handle is
+    either a CallLog, or a binary handle that gets compact records from a
+    RecordWriter.
+
+    every, fraction and per_second choose which calls get logged, each
+    decorated function gets its own Sampler.
+    """
+    def __init__(self, file_handle=stdout, buffered=False, deferred=False,
+                 every=None, fraction=None, per_second=None,
+                 **buffer_options):
+        if buffered:
+            file_handle = BufferedWriter(file_handle, **buffer_options)
+        elif buffer_options:
+            raise TypeError("buffer options given without buffered=True")
+        if deferred and not hasattr(file_handle, "record"):
+            file_handle = RecordWriter(file_handle)
+        self.file_handle = file_handle
+        self.deferred = deferred
+        self.sampling = (every, fraction, per_second)
+        self._async_sink = None
+
+    def __call__(self, fn):
+        sink = self.file_handle
+        if _is_async(fn):
+            # Made on first use and shared by this Logger's async functions.
+            if self._async_sink is None:
+                self._async_sink = _async_sink(sink, self.deferred)
+            sink = self._async_sink
+        return _wrap(fn, _emitter(fn, sink, self.deferred),
+                     make_sampler(*self.sampling))
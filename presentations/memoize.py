@@ -0,0 +1,116 @@
+"""A caching decorator class that knows the decorated function's signature.
+
+A *args, **kwargs wrapper sees string_stuff("m", "S ", " E") and
+string_stuff("m", prefix="S ", suffix=" E") differently, so a cache keyed on
+(args, kwargs) stores them twice. Memoize binds each call to the real
+signature, with defaults filled in, before building the key, so every way of
+spelling the same call hits the same entry:
+
+    @Memoize(maxsize=1024, ttl=60)
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+    string_stuff("m", "S ", " E")
+    string_stuff("m", suffix=" E", prefix="S ")
+    string_stuff.cache_info()
+    # >>> CacheInfo(hits=1, misses=1, evictions=0, expired=0, maxsize=1024, currsize=1)
+
+maxsize=None never evicts, ttl=None never expires. Calls with unhashable
+arguments go straight to the function and are not cached.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from time import monotonic
+
+CacheInfo = namedtuple("CacheInfo", "hits misses evictions expired maxsize currsize")
+
+
+def _key_maker(fn):
+    # inspect is slow to import and only needed when decorating.
+    import inspect
+    simple_kinds = (inspect.Parameter.POSITIONAL_ONLY,
+                    inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    signature = inspect.signature(fn)
+    params = list(signature.parameters.values())
+    var_keyword = [p.name for p in params
+                   if p.kind == inspect.Parameter.VAR_KEYWORD]
+    simple = all(p.kind in simple_kinds for p in params)
+    n_params = len(params)
+
+    def make_key(args, kwargs):
+        # Every parameter given positionally binds to exactly args, skip the
+        # (comparatively slow) bind.
+        if simple and not kwargs and len(args) == n_params:
+            return args
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if var_keyword:
+            name = var_keyword[0]
+            arguments[name] = tuple(sorted(arguments[name].items()))
+        return tuple(arguments.values())
+    return make_key
+
+
+class Memoize:
+    def __init__(self, maxsize=128, ttl=None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be positive or None")
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def __call__(self, fn):
+        make_key = _key_maker(fn)
+        maxsize, ttl = self.maxsize, self.ttl
+        cache = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+        @wraps(fn)
+        def inner_memoize(*args, **kwargs):
+            try:
+                key = make_key(args, kwargs)
+                hash(key)
+            except TypeError:
+                # A bad call raises the usual TypeError from fn itself,
+                # unhashable arguments are just not cached.
+                return fn(*args, **kwargs)
+            with lock:
+                entry = cache.get(key)
+                if entry is not None:
+                    value, expires = entry
+                    if expires is None or expires > monotonic():
+                        cache.move_to_end(key)
+                        stats["hits"] += 1
+                        return value
+                    del cache[key]
+                    stats["expired"] += 1
+                stats["misses"] += 1
+            # Called without the lock so a slow fn doesn't serialise every
+            # caller. Two threads missing on the same key both compute it.
+            value = fn(*args, **kwargs)
+            expires = None if ttl is None else monotonic() + ttl
+            with lock:
+                cache[key] = (value, expires)
+                cache.move_to_end(key)
+                if maxsize is not None and len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    stats["evictions"] += 1
+            return value
+
+        def cache_info():
+            with lock:
+                return CacheInfo(stats["hits"], stats["misses"],
+                                 stats["evictions"], stats["expired"],
+                                 maxsize, len(cache))
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                for k in stats:
+                    stats[k] = 0
+
+        inner_memoize.cache_info = cache_info
+        inner_memoize.cache_clear = cache_clear
+        return inner_memoize
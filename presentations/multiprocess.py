@@ -0,0 +1,191 @@
+"""One writer process for log records from many processes.
+
+Logger(stdout) in every worker of a multiprocessing pool or a pre-fork
+server means every process writes to the same handle: lines interleave and
+the processes fight over the file. ProcessSink starts a single writer
+process, and every process's write() sends the record to it instead:
+
+    sink = ProcessSink("calls.log")     # before forking or starting a pool
+
+    @Logger(sink)
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+    ...
+    sink.close()                        # in the parent, once workers are done
+
+target is a path (opened for appending by the writer) or a file
+descriptor, 1 for stdout.
+
+Records are stamped with the time write() was called. The writer holds each
+one back for reorder_window seconds and writes them in timestamp order, so
+records from different processes come out in order as long as none spends
+longer than that in the pipe. They are written in batches of up to
+batch_size, and the writer holds at most max_records, after that write()
+blocks until it catches up.
+
+Records go down a pipe that every process shares, write() sends the record
+before it returns, under a lock shared by all the processes. That survives
+both multiprocessing and a plain os.fork(), even if the parent wrote before
+forking, and a process can exit however it likes once write() has returned.
+A process killed in the middle of write() leaves the lock held and every
+other process stuck, so close() and join() a pool rather than terminate()
+it, which is what leaving a "with Pool()" block does.
+
+stats() reports how many records and bytes have been written, in how many
+batches, the throughput, how many records the writer is holding and the
+most it has held.
+"""
+import heapq
+import os
+import struct
+import time
+import weakref
+
+# Indexes into the shared stats array.
+_RECORDS, _BYTES, _BATCHES, _DEPTH, _MAX_DEPTH, _STARTED = range(6)
+
+# A record is its timestamp followed by the utf-8 line, empty means stop.
+_STAMP = struct.Struct("d")
+
+
+def _open_target(target):
+    if isinstance(target, int):
+        return os.fdopen(os.dup(target), "ab", buffering=0)
+    return open(target, "ab", buffering=0)
+
+
+def _writer_main(records, target, batch_size, reorder_window, max_records,
+                 stats):
+    out = _open_target(target)
+    stamp_size = _STAMP.size
+    unpack = _STAMP.unpack_from
+    pending = []    # heap of (timestamp, sequence, line)
+    sequence = 0
+    stopping = False
+    try:
+        while not stopping or pending:
+            timeout = reorder_window
+            if pending:
+                timeout = max(0.0, pending[0][0] + reorder_window
+                              - time.time())
+            # Pick up whatever is waiting, only sleeping for the first one.
+            while not stopping and len(pending) < max_records \
+                    and records.poll(timeout):
+                timeout = 0
+                record = records.recv_bytes()
+                if not record:
+                    stopping = True
+                else:
+                    heapq.heappush(pending, (unpack(record)[0], sequence,
+                                             record[stamp_size:]))
+                    sequence += 1
+            stats[_DEPTH] = len(pending)
+            if len(pending) > stats[_MAX_DEPTH]:
+                stats[_MAX_DEPTH] = len(pending)
+            if len(pending) >= max_records:
+                # Full, write() waits on the pipe until the oldest can go.
+                time.sleep(max(0.0, pending[0][0] + reorder_window
+                               - time.time()))
+
+            # Everything older than the window is safe to write, when
+            # stopping everything is.
+            cutoff = float("inf") if stopping else time.time() - reorder_window
+            while pending and pending[0][0] <= cutoff:
+                batch = []
+                while pending and pending[0][0] <= cutoff \
+                        and len(batch) < batch_size:
+                    batch.append(heapq.heappop(pending)[2])
+                data = b"".join(batch)
+                out.write(data)
+                with stats.get_lock():
+                    stats[_RECORDS] += len(batch)
+                    stats[_BYTES] += len(data)
+                    stats[_BATCHES] += 1
+            stats[_DEPTH] = len(pending)
+    finally:
+        out.close()
+
+
+# Every live sink, so a forked child can forget their writers.
+_sinks = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    # The child inherited the writers as multiprocessing children of its
+    # own, its exit hook would terminate() and join() them.
+    if not _sinks:
+        return
+    import multiprocessing
+    for sink in _sinks:
+        multiprocessing.process._children.discard(sink._writer)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class ProcessSink:
+    def __init__(self, target=1, batch_size=1024, reorder_window=0.1,
+                 max_records=100000):
+        import multiprocessing
+        self._context = multiprocessing.get_context()
+        reader, self._pipe = self._context.Pipe(duplex=False)
+        self._lock = self._context.Lock()
+        self._stats = self._context.Array("d", 6)
+        self._stats[_STARTED] = time.time()
+        self._writer = self._context.Process(
+            target=_writer_main, name="ProcessSink writer", daemon=True,
+            args=(reader, target, batch_size, reorder_window, max_records,
+                  self._stats))
+        self._writer.start()
+        reader.close()
+        self._owner = os.getpid()
+        self.closed = False
+        _sinks.add(self)
+
+    def write(self, line):
+        record = _STAMP.pack(time.time()) + line.encode("utf-8", "replace")
+        with self._lock:
+            self._pipe.send_bytes(record)
+
+    def flush(self):
+        # Records are written by another process, there's nothing to wait
+        # for here that wouldn't also wait for every other process.
+        pass
+
+    def stats(self):
+        stats = self._stats
+        with stats.get_lock():
+            records, written, batches, depth, max_depth, started = stats[:]
+        elapsed = time.time() - started
+        return {
+            "records": int(records),
+            "bytes": int(written),
+            "batches": int(batches),
+            "records_per_second": records / elapsed if elapsed > 0 else 0.0,
+            "queue_depth": int(depth),
+            "max_queue_depth": int(max_depth),
+        }
+
+    def close(self):
+        """Write everything still queued and stop the writer.
+
+        Only the process that created the sink can close it, call it once
+        the other processes have finished writing.
+        """
+        if self.closed:
+            return
+        if os.getpid() != self._owner:
+            raise RuntimeError("ProcessSink can only be closed by the "
+                               "process that created it")
+        self.closed = True
+        with self._lock:
+            self._pipe.send_bytes(b"")
+        self._writer.join()
+        self._pipe.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
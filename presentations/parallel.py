@@ -0,0 +1,187 @@
+"""[a*2 for a in lst] on every core.
+
+    def double(a):
+        return a * 2
+
+    parallel_map(double, lst)
+    # >>> the same list as [double(a) for a in lst]
+    parallel_map(double, lst, predicate=is_even)
+    # >>> [double(a) for a in lst if is_even(a)]
+
+The input is cut into chunks that are run in a ProcessPoolExecutor. fn and
+predicate are pickled to the workers so they have to be module level
+functions, not lambdas or closures.
+
+Chunk size is adaptive unless you give one: the first chunks are small,
+and once some have finished the chunk size is set so a chunk takes about
+target_seconds, long enough that pickling and scheduling are noise but short
+enough to keep every worker busy to the end.
+
+Results come back in input order. With ordered=False they come back in
+whatever order chunks finish, which keeps workers busy when chunk times
+vary a lot.
+
+A NumPy array input is copied once into shared memory and workers read
+their chunk from there, instead of every chunk being pickled. Not an array
+of Python objects though: its memory is pointers into this process, so it
+is pickled a chunk at a time like any other input.
+"""
+import os
+from itertools import islice
+from time import perf_counter
+
+_FIRST_CHUNK = 16
+_MAX_CHUNK = 1 << 16
+
+
+def _run_chunk(fn, predicate, items):
+    start = perf_counter()
+    if predicate is None:
+        results = [fn(item) for item in items]
+    else:
+        results = [fn(item) for item in items if predicate(item)]
+    return perf_counter() - start, results
+
+
+# Worker side cache of attached shared memory, name -> (segment, array)
+_attached = {}
+
+
+def _attach(name):
+    # The parent owns the segment. Before 3.13 there's no track=False and
+    # attaching registers it with the worker's resource tracker, which then
+    # reports it leaked, and unlinks it again, when the worker exits.
+    from multiprocessing import resource_tracker, shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _run_shared_chunk(fn, predicate, shared, start, stop):
+    name, shape, dtype = shared
+    if name not in _attached:
+        import numpy
+        segment = _attach(name)
+        _attached.clear()
+        _attached[name] = (segment, numpy.ndarray(shape, dtype,
+                                                  buffer=segment.buf))
+    return _run_chunk(fn, predicate, _attached[name][1][start:stop])
+
+
+class _Chunker:
+    """Hands out chunks, resizing them from the timings that come back."""
+    def __init__(self, chunksize, target_seconds):
+        self.fixed = chunksize is not None
+        self.size = chunksize or _FIRST_CHUNK
+        self.target = target_seconds
+
+    def finished(self, n_items, seconds):
+        if self.fixed or not n_items:
+            return
+        if seconds <= 0:
+            size = _MAX_CHUNK
+        else:
+            size = int(self.target * n_items / seconds)
+        self.size = max(1, min(_MAX_CHUNK, size))
+
+
+def _chunks(iterable, chunker):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, chunker.size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run(executor, jobs, workers, chunker, ordered):
+    # jobs yields (n_items, submit function) pairs, no more than two chunks
+    # per worker are in flight at once.
+    from concurrent.futures import FIRST_COMPLETED, wait
+    pending = {}
+    done_chunks = {}
+    next_submit = next_yield = 0
+    jobs = iter(jobs)
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < 2 * workers:
+            try:
+                n_items, submit = next(jobs)
+            except StopIteration:
+                exhausted = True
+                break
+            pending[submit()] = (next_submit, n_items)
+            next_submit += 1
+        if not pending:
+            return
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            number, n_items = pending.pop(future)
+            seconds, results = future.result()
+            chunker.finished(n_items, seconds)
+            if ordered:
+                done_chunks[number] = results
+            else:
+                yield from results
+        while next_yield in done_chunks:
+            yield from done_chunks.pop(next_yield)
+            next_yield += 1
+
+
+def imap(fn, iterable, predicate=None, workers=None, chunksize=None,
+         ordered=True, target_seconds=0.05, executor=None):
+    """Generator version of parallel_map."""
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(workers)
+    chunker = _Chunker(chunksize, target_seconds)
+    segment = None
+    try:
+        if type(iterable).__module__ == "numpy" \
+                and not iterable.dtype.hasobject:
+            from multiprocessing import shared_memory
+            import numpy
+            array = numpy.ascontiguousarray(iterable)
+            segment = shared_memory.SharedMemory(create=True,
+                                                 size=max(array.nbytes, 1))
+            numpy.ndarray(array.shape, array.dtype,
+                          buffer=segment.buf)[...] = array
+            shared = (segment.name, array.shape, array.dtype.str)
+
+            def jobs():
+                start = 0
+                while start < len(array):
+                    stop = min(start + chunker.size, len(array))
+                    yield stop - start, (
+                        lambda start=start, stop=stop: executor.submit(
+                            _run_shared_chunk, fn, predicate, shared,
+                            start, stop))
+                    start = stop
+        else:
+            def jobs():
+                for chunk in _chunks(iterable, chunker):
+                    yield len(chunk), (lambda chunk=chunk: executor.submit(
+                        _run_chunk, fn, predicate, chunk))
+        yield from _run(executor, jobs(), workers, chunker, ordered)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+
+def parallel_map(fn, iterable, predicate=None, workers=None, chunksize=None,
+                 ordered=True, target_seconds=0.05, executor=None):
+    """[fn(a) for a in iterable if predicate(a)] across worker processes."""
+    return list(imap(fn, iterable, predicate, workers, chunksize, ordered,
+                     target_seconds, executor))
@@ -0,0 +1,154 @@
+"""Chained map and filter without the intermediate lists.
+
+    [a*2 for a in lst if a%2 == 0]
+    Pipeline(lst).filter(lambda a: a % 2 == 0).map(lambda a: a * 2).to_list()
+
+    {k+'z': v+1 for k,v in dict1.items()}
+    Pipeline(dict1.items()).starmap(lambda k, v: (k + 'z', v + 1)).to_dict()
+
+    tuple([t + 1 for t in tpl])
+    Pipeline(tpl).map(lambda t: t + 1).to_tuple()
+
+Nothing runs until the pipeline is materialised. Then the stages are
+chained as the builtin map and filter iterators (and itertools for starmap
+and flat_map), so every element goes through all the stages in one pass and
+no container is built except the one asked for: to_tuple() doesn't make a
+list first.
+
+With numpy=True, to_list(), to_tuple() and to_array() first try running
+the stages on a NumPy array of the input: each map function is called once
+with the whole array and each filter function must return a boolean mask.
+That works for arithmetic lambdas like the ones above. If a stage can't be
+run that way (it raises, returns the wrong shape, or is a flat_map) the
+pipeline runs element by element instead, so stage functions must be safe
+to call twice. An iterator source always runs element by element. NumPy is
+only imported when it's used.
+
+The answer is the same either way. Only a source of nothing but floats
+becomes a float64 array, and overflow, division by zero and invalid
+operations raise inside it rather than giving inf or nan where Python would
+have raised. Anything else, ints included, becomes an array of the Python
+objects themselves: int64 would wrap around where Python ints don't, and
+mixing ints with floats would turn them all into floats. That still saves
+a function call per element per stage, but is nowhere near as fast as the
+float64 path. An ndarray source is used as it is.
+"""
+from itertools import chain, starmap
+
+
+class _NotVectorisable(Exception):
+    pass
+
+
+class Pipeline:
+    def __init__(self, iterable, numpy=False):
+        self._source = iterable
+        self._stages = ()
+        self.numpy = numpy
+
+    def _then(self, kind, fn):
+        pipeline = Pipeline(self._source, self.numpy)
+        pipeline._stages = self._stages + ((kind, fn),)
+        return pipeline
+
+    def map(self, fn):
+        return self._then("map", fn)
+
+    def starmap(self, fn):
+        """map for stages whose elements are argument tuples."""
+        return self._then("starmap", fn)
+
+    def filter(self, predicate):
+        return self._then("filter", predicate)
+
+    def flat_map(self, fn):
+        """fn returns an iterable per element, its items are passed on."""
+        return self._then("flat_map", fn)
+
+    @property
+    def stages(self):
+        return [kind for kind, _ in self._stages]
+
+    def __iter__(self):
+        it = iter(self._source)
+        for kind, fn in self._stages:
+            if kind == "map":
+                it = map(fn, it)
+            elif kind == "filter":
+                it = filter(fn, it)
+            elif kind == "starmap":
+                it = starmap(fn, it)
+            else:
+                it = chain.from_iterable(map(fn, it))
+        return it
+
+    def _vectorised(self):
+        import numpy
+        source = self._source
+        try:
+            arr = numpy.asarray(source)
+        except ValueError:
+            # Ragged, like [(1,), (1, 2)].
+            raise _NotVectorisable
+        if arr.ndim != 1 or arr.dtype.kind not in "biuf":
+            raise _NotVectorisable
+        if not isinstance(source, numpy.ndarray) and (
+                arr.dtype.kind != "f" or set(map(type, source)) != {float}):
+            arr = numpy.asarray(source, dtype=object)
+        for kind, fn in self._stages:
+            if kind not in ("map", "filter"):
+                raise _NotVectorisable
+            try:
+                with numpy.errstate(all="raise"):
+                    result = numpy.asarray(fn(arr))
+            except Exception:
+                raise _NotVectorisable
+            if result.shape != arr.shape:
+                raise _NotVectorisable
+            if kind == "map":
+                arr = result
+            elif result.dtype == bool:
+                arr = arr[result]
+            elif result.dtype == object:
+                # Python objects, so filter() would have used their truth.
+                arr = arr[result.astype(bool)]
+            else:
+                raise _NotVectorisable
+        return arr
+
+    def _try_numpy(self):
+        # An iterator would be used up by a failed attempt.
+        if not self.numpy or iter(self._source) is self._source:
+            return None
+        try:
+            return self._vectorised()
+        except _NotVectorisable:
+            return None
+
+    def to_list(self):
+        arr = self._try_numpy()
+        if arr is not None:
+            return arr.tolist()
+        return list(self)
+
+    def to_tuple(self):
+        arr = self._try_numpy()
+        if arr is not None:
+            return tuple(arr.tolist())
+        return tuple(self)
+
+    def to_dict(self):
+        """Materialise a pipeline of (key, value) pairs."""
+        return dict(self)
+
+    def to_array(self, dtype=None):
+        import numpy
+        arr = self._try_numpy()
+        if arr is None:
+            return numpy.fromiter(self, dtype=dtype or float)
+        if arr.dtype == object:
+            return numpy.array(arr.tolist(), dtype=dtype)
+        return arr if dtype is None else arr.astype(dtype)
+
+    def __repr__(self):
+        return "<Pipeline %s>" % " | ".join(self.stages or ["source"])
@@ -0,0 +1,152 @@
+"""A decorator class that times calls instead of logging them.
+
+    profiler = Profiler()
+
+    @profiler
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+    profiler.snapshot()["string_stuff"]["p99"]
+
+For each decorated function it keeps the number of calls, the total time,
+the self time (total minus time spent in other functions decorated by the
+same Profiler) and a latency histogram. The histogram has four buckets per
+power of two nanoseconds, so percentiles are accurate to within 19%, and
+recording a call is a bit_length and a list increment.
+
+Every thread records into its own stats so there are no locks on the call
+path, snapshot() merges them. dump() writes the snapshot as JSON.
+"""
+import threading
+from functools import wraps
+from time import perf_counter_ns
+
+_SUB_BITS = 2
+_N_BUCKETS = (64 + 1) << _SUB_BITS
+
+
+def _bucket(ns):
+    bits = ns.bit_length()
+    if bits <= _SUB_BITS:
+        return ns
+    return (bits << _SUB_BITS) | ((ns >> (bits - 1 - _SUB_BITS))
+                                 & ((1 << _SUB_BITS) - 1))
+
+
+def _bucket_upper(index):
+    # The largest duration in ns that lands in bucket index.
+    bits, sub = index >> _SUB_BITS, index & ((1 << _SUB_BITS) - 1)
+    if bits <= _SUB_BITS:
+        return index
+    shift = bits - 1 - _SUB_BITS
+    return (((1 << _SUB_BITS) | sub) + 1 << shift) - 1
+
+
+class _Stats:
+    __slots__ = ("calls", "total", "self_time", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0
+        self.self_time = 0
+        self.buckets = [0] * _N_BUCKETS
+
+
+def _percentile(buckets, calls, fraction):
+    wanted = fraction * calls
+    seen = 0
+    for index, count in enumerate(buckets):
+        seen += count
+        if count and seen >= wanted:
+            return _bucket_upper(index) / 1e9
+    return 0.0
+
+
+class Profiler:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _thread_state(self):
+        local = self._local
+        local.stack = []
+        local.stats = {}
+        with self._lock:
+            self._shards.append(local.stats)
+        return local
+
+    def __call__(self, fn):
+        name = fn.__qualname__
+        local = self._local
+        thread_state = self._thread_state
+
+        @wraps(fn)
+        def inner_profile(*args, **kwargs):
+            try:
+                stack = local.stack
+            except AttributeError:
+                stack = thread_state().stack
+            # Nested profiled calls add their time to our slot on the stack.
+            stack.append(0)
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                stats = local.stats.get(name)
+                if stats is None:
+                    stats = local.stats[name] = _Stats()
+                stats.calls += 1
+                stats.total += elapsed
+                stats.self_time += elapsed - children
+                stats.buckets[_bucket(elapsed)] += 1
+        return inner_profile
+
+    def snapshot(self):
+        """Merged stats for every function, times in seconds."""
+        merged = {}
+        with self._lock:
+            shards = [dict(shard) for shard in self._shards]
+        for shard in shards:
+            for name, stats in shard.items():
+                total = merged.get(name)
+                if total is None:
+                    total = merged[name] = _Stats()
+                total.calls += stats.calls
+                total.total += stats.total
+                total.self_time += stats.self_time
+                total.buckets = [a + b for a, b
+                                 in zip(total.buckets, stats.buckets)]
+        result = {}
+        for name, stats in sorted(merged.items()):
+            calls = stats.calls
+            result[name] = {
+                "calls": calls,
+                "total": stats.total / 1e9,
+                "self": stats.self_time / 1e9,
+                "mean": stats.total / 1e9 / calls if calls else 0.0,
+                "p50": _percentile(stats.buckets, calls, 0.5),
+                "p99": _percentile(stats.buckets, calls, 0.99),
+                "p999": _percentile(stats.buckets, calls, 0.999),
+                # upper bound of the bucket in ns -> number of calls
+                "histogram": {_bucket_upper(i): count for i, count
+                              in enumerate(stats.buckets) if count},
+            }
+        return result
+
+    def reset(self):
+        """Zero every counter. Calls in flight may be counted partially."""
+        with self._lock:
+            for shard in self._shards:
+                for stats in shard.values():
+                    stats.calls = stats.total = stats.self_time = 0
+                    stats.buckets = [0] * _N_BUCKETS
+
+    def dump(self, file_handle):
+        import json
+        json.dump(self.snapshot(), file_handle, indent=2, sort_keys=True)
+        file_handle.write("\n")
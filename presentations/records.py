@@ -0,0 +1,172 @@
+"""Call records that are formatted when they're read, not when they're made.
+
+The logger decorators build "%s(%s : %s)" % (fn.__name__, args, kwargs) on
+every call. That is a repr of every argument whether anyone reads the log or
+not. The sinks in here store a function id, a timestamp and the arguments
+themselves (CallLog) or a cheap marshal encoding of them (RecordWriter), and
+only turn them into text when the log is read.
+
+    calls = CallLog()
+
+    @Logger(calls, deferred=True)
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+    string_stuff("my message", prefix="START", suffix="END")
+    list(calls)
+    # >>> ["string_stuff(('my message',) : {'prefix': 'START', 'suffix': 'END'})"]
+
+CallLog keeps references, so later mutation of an argument shows up in the
+formatted output. RecordWriter copies the arguments into bytes at call time
+and can be decoded by another process:
+
+    python -m presentations.records calls.bin
+
+Arguments marshal can't encode (anything that isn't a builtin type) are
+stored as their repr. The marshal format is tied to the python version, read
+the log with the same version that wrote it.
+"""
+import marshal
+import struct
+import sys
+import time
+from collections import deque
+
+# Record types
+_NAME = 0     # payload is the utf-8 name for fn_id
+_VALUES = 1   # payload is marshal((args, kwargs))
+_REPRS = 2    # payload is marshal((arg reprs, {key: value repr}))
+
+# type, fn_id, timestamp, payload length
+_HEADER = struct.Struct("<BHdI")
+
+
+def format_call(name, args, kwargs):
+    """The same text the eager logger writes for a call."""
+    return "%s(%s : %s)" % (name, args, kwargs)
+
+
+class _Repr(str):
+    # A repr that formats as itself instead of being quoted again.
+    def __repr__(self):
+        return self
+
+
+class CallLog:
+    """In memory call log. Iterating it formats the records."""
+    def __init__(self, maxlen=None):
+        self.names = []
+        self._ids = {}
+        self.entries = deque(maxlen=maxlen)
+
+    def register(self, fn):
+        """Return the id records for fn are stored under."""
+        key = fn.__name__
+        if key not in self._ids:
+            self._ids[key] = len(self.names)
+            self.names.append(key)
+        return self._ids[key]
+
+    def record(self, fn_id, args, kwargs):
+        self.entries.append((fn_id, time.time(), args, kwargs))
+
+    def records(self):
+        """Yield (name, timestamp, args, kwargs) tuples."""
+        names = self.names
+        for fn_id, timestamp, args, kwargs in list(self.entries):
+            yield names[fn_id], timestamp, args, kwargs
+
+    def __iter__(self):
+        for name, _, args, kwargs in self.records():
+            yield format_call(name, args, kwargs)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class RecordWriter:
+    """Writes compact binary call records to a binary file handle.
+
+    With names, another RecordWriter, names are registered there instead:
+    they go to its handle and both writers use the same ids.
+    """
+    def __init__(self, file_handle, names=None):
+        self.file_handle = file_handle
+        self._names = names
+        self._ids = {} if names is None else names._ids
+
+    def register(self, fn):
+        if self._names is not None:
+            return self._names.register(fn)
+        key = fn.__name__
+        if key not in self._ids:
+            fn_id = self._ids[key] = len(self._ids)
+            if fn_id > 0xffff:
+                raise ValueError("RecordWriter can hold at most 65536 names")
+            name = key.encode("utf-8")
+            self.file_handle.write(
+                _HEADER.pack(_NAME, fn_id, time.time(), len(name)) + name)
+        return self._ids[key]
+
+    def record(self, fn_id, args, kwargs):
+        try:
+            payload = marshal.dumps((args, kwargs))
+            kind = _VALUES
+        except ValueError:
+            payload = marshal.dumps((tuple(repr(a) for a in args),
+                                     {k: repr(v) for k, v in kwargs.items()}))
+            kind = _REPRS
+        self.file_handle.write(
+            _HEADER.pack(kind, fn_id, time.time(), len(payload)) + payload)
+
+    def flush(self):
+        if hasattr(self.file_handle, "flush"):
+            self.file_handle.flush()
+
+
+def read_records(file_handle):
+    """Decode a RecordWriter stream into (name, timestamp, args, kwargs).
+
+    Arguments that were stored as reprs come back as strings that repr as
+    themselves, so format_call gives the same text the eager logger would.
+    A truncated final record (a crashed writer) is ignored.
+    """
+    names = {}
+    header_size = _HEADER.size
+    while True:
+        header = file_handle.read(header_size)
+        if len(header) < header_size:
+            return
+        kind, fn_id, timestamp, size = _HEADER.unpack(header)
+        payload = file_handle.read(size)
+        if len(payload) < size:
+            return
+        if kind == _NAME:
+            names[fn_id] = payload.decode("utf-8")
+            continue
+        args, kwargs = marshal.loads(payload)
+        if kind == _REPRS:
+            args = tuple(_Repr(a) for a in args)
+            kwargs = {k: _Repr(v) for k, v in kwargs.items()}
+        yield names.get(fn_id, "<fn %d>" % fn_id), timestamp, args, kwargs
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        sys.stderr.write("usage: python -m presentations.records FILE\n")
+        return 2
+    with open(argv[0], "rb") as f:
+        for name, timestamp, args, kwargs in read_records(f):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S",
+                                  time.localtime(timestamp))
+            print("%s.%06d %s" % (stamp, timestamp % 1 * 1e6,
+                                  format_call(name, args, kwargs)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""A fixed size call log in a memory mapped file.
+
+Logger takes any file handle, but a regular file costs a write syscall per
+record and grows forever. RingLog is a file handle for Logger that writes
+each record into the next fixed size slot of a memory mapped file, so a
+record is a memory copy, and when the slots run out the oldest records are
+overwritten:
+
+    @Logger(RingLog("calls.ring", slots=65536, slot_size=256))
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+Records longer than slot_size - 18 bytes are truncated.
+
+The file is always a readable ring, even if the process writing it crashed
+(the operating system writes the mapped pages out), so it works as a flight
+recorder. Read it, or follow it while it's being written, with:
+
+    python -m presentations.ring calls.ring
+    python -m presentations.ring --follow calls.ring
+
+Opening an existing ring with the same geometry carries on where it left
+off.
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+from itertools import count
+
+_MAGIC = b"PRESRING"
+_VERSION = 1
+# magic, version, slot_size, slots, next sequence number (as of close())
+_HEADER = struct.Struct("<8sIII4xQ")
+# sequence number + 1 (0 marks an empty or half written slot), timestamp,
+# payload length
+_SLOT = struct.Struct("<QdH")
+
+
+class RingLog:
+    def __init__(self, path, slots=65536, slot_size=256):
+        if slot_size <= _SLOT.size or slot_size - _SLOT.size > 0xffff:
+            raise ValueError("slot_size must be between %d and %d"
+                             % (_SLOT.size + 1, _SLOT.size + 0xffff))
+        if slots < 1:
+            raise ValueError("slots must be positive")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        size = _HEADER.size + slots * slot_size
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            start = 0
+            reuse = False
+            header = os.pread(fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and \
+                    os.fstat(fd).st_size == size:
+                magic, version, old_size, old_slots, next_seq = \
+                    _HEADER.unpack(header)
+                if (magic, version, old_size, old_slots) == \
+                        (_MAGIC, _VERSION, slot_size, slots):
+                    start, reuse = next_seq, True
+            if not reuse:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        if reuse:
+            # A crash skips close(), the slots know better than the header.
+            records = _read_slots(self._map, slots, slot_size)
+            if records:
+                start = max(start, records[-1][0] + 1)
+        _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, slot_size, slots,
+                          start)
+        self._seq = count(start)
+        self._payload_size = slot_size - _SLOT.size
+
+    def write(self, record):
+        if isinstance(record, str):
+            record = record.encode("utf-8", "replace")
+        payload = record[:self._payload_size]
+        # next() on a count is atomic, threads never get the same slot.
+        seq = next(self._seq)
+        offset = _HEADER.size + (seq % self.slots) * self.slot_size
+        buf = self._map
+        # Mark the slot empty, fill it, then publish the sequence number so
+        # a reader never takes a half written slot for a whole one.
+        buf[offset:offset + 8] = b"\0" * 8
+        end = offset + _SLOT.size + len(payload)
+        buf[offset + _SLOT.size:end] = payload
+        struct.pack_into("<dH", buf, offset + 8, time.time(), len(payload))
+        struct.pack_into("<Q", buf, offset, seq + 1)
+        return len(record)
+
+    def flush(self):
+        """Ask the OS to write the ring to disk now (this one is a syscall)."""
+        self._map.flush()
+
+    def close(self):
+        if not self._map.closed:
+            seq = next(self._seq)
+            struct.pack_into("<Q", self._map, _HEADER.size - 8, seq)
+            self._map.flush()
+            self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _read_slots(buf, slots, slot_size):
+    # -> [(seq, timestamp, payload)] for every complete slot
+    records = []
+    for slot in range(slots):
+        offset = _HEADER.size + slot * slot_size
+        stamp, timestamp, length = _SLOT.unpack_from(buf, offset)
+        if not stamp or length > slot_size - _SLOT.size:
+            continue
+        payload = bytes(buf[offset + _SLOT.size:offset + _SLOT.size + length])
+        # Overwritten while we were reading it, it belongs to a newer record
+        # which the next read will pick up.
+        if struct.unpack_from("<Q", buf, offset)[0] != stamp:
+            continue
+        records.append((stamp - 1, timestamp, payload))
+    records.sort()
+    return records
+
+
+def _open_ring(path):
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, slot_size, slots, _ = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION:
+        buf.close()
+        raise ValueError("%s is not a ring log" % path)
+    return buf, slots, slot_size
+
+
+def read_ring(path):
+    """Every record in the ring, oldest first, as (seq, timestamp, bytes)."""
+    buf, slots, slot_size = _open_ring(path)
+    try:
+        return _read_slots(buf, slots, slot_size)
+    finally:
+        buf.close()
+
+
+def follow_ring(path, interval=0.2):
+    """Yield records as they're written, starting with what's there."""
+    buf, slots, slot_size = _open_ring(path)
+    try:
+        last = -1
+        while True:
+            for record in _read_slots(buf, slots, slot_size):
+                if record[0] > last:
+                    last = record[0]
+                    yield record
+            time.sleep(interval)
+    finally:
+        buf.close()
+
+
+def _format(record):
+    seq, timestamp, payload = record
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+    return "%s.%06d %s" % (stamp, timestamp % 1 * 1e6,
+                           payload.decode("utf-8", "replace").rstrip("\n"))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    follow = "--follow" in argv or "-f" in argv
+    paths = [a for a in argv if a not in ("--follow", "-f")]
+    if len(paths) != 1:
+        sys.stderr.write("usage: python -m presentations.ring [--follow] FILE\n")
+        return 2
+    records = follow_ring(paths[0]) if follow else read_ring(paths[0])
+    try:
+        for record in records:
+            print(_format(record), flush=follow)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Decide which calls get logged.
+
+A Sampler is called once per call of the decorated function and says whether
+that call should be logged. The logger only formats the arguments for calls
+the sampler keeps, so a suppressed call costs the sampler and nothing else.
+
+    every=N       keep the 1st, N+1th, 2N+1th ... call
+    fraction=p    keep each call with probability p
+    per_second=K  keep at most K calls a second (a token bucket, so a burst
+                  of up to K calls is allowed after a quiet second). K can be
+                  below 1, per_second=0.5 keeps a call every two seconds
+
+Given more than one, a call is only kept if all of them agree. The counts of
+kept and suppressed calls are exact, even when called from several threads.
+"""
+import threading
+from time import monotonic
+
+
+class Sampler:
+    def __init__(self, every=None, fraction=None, per_second=None, seed=None):
+        if every is not None and every < 1:
+            raise ValueError("every must be at least 1")
+        if fraction is not None and not 0 <= fraction <= 1:
+            raise ValueError("fraction must be between 0 and 1")
+        if per_second is not None and per_second <= 0:
+            raise ValueError("per_second must be positive")
+        self.every = every
+        self.fraction = fraction
+        self.per_second = per_second
+        self.calls = 0
+        self.kept = 0
+        if fraction is not None:
+            import random
+            self._random = random.Random(seed).random
+        # Never less than one token's room, or a rate below 1 could never
+        # save up enough to keep a call.
+        self._capacity = None if per_second is None else max(per_second, 1)
+        self._tokens = self._capacity
+        self._last = monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def suppressed(self):
+        return self.calls - self.kept
+
+    def __call__(self):
+        with self._lock:
+            calls = self.calls
+            self.calls = calls + 1
+            if self.every is not None and calls % self.every:
+                return False
+            if self.fraction is not None and self._random() >= self.fraction:
+                return False
+            if self.per_second is not None:
+                now = monotonic()
+                self._tokens = min(self._capacity, self._tokens
+                                   + (now - self._last) * self.per_second)
+                self._last = now
+                if self._tokens < 1:
+                    return False
+                self._tokens -= 1
+            self.kept += 1
+            return True
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.kept = 0
+
+    def __repr__(self):
+        return "<Sampler kept %d of %d calls>" % (self.kept, self.calls)
+
+
+def make_sampler(every=None, fraction=None, per_second=None, seed=None):
+    """A Sampler, or None when every call should be kept."""
+    if every is None and fraction is None and per_second is None:
+        return None
+    return Sampler(every, fraction, per_second, seed)
@@ -0,0 +1,129 @@
+"""Shuffling and sampling without sorted(lst, key=lambda _: random()).
+
+Sorting on a random key is O(n log n) and calls a lambda per element. These
+are all linear, and all take a seed so a run can be repeated:
+
+    shuffle(lst, seed=42)            # Fisher-Yates, in place
+    shuffled(iterable, seed=42)      # a new shuffled list
+    reservoir_sample(lines, 1000)    # k items from an iterator of any length
+    shuffle_file("big.csv", "shuffled.csv", max_memory=1 << 30)
+
+seed can be anything random.Random accepts, or a random.Random instance to
+share one stream of random numbers between calls.
+"""
+import math
+import os
+import random
+from itertools import islice
+
+_END = object()
+
+
+def _rng(seed):
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def shuffle(seq, seed=None):
+    """Shuffle a mutable sequence in place and return it.
+
+    random.shuffle is a Fisher-Yates shuffle, this is it with a seed.
+    """
+    _rng(seed).shuffle(seq)
+    return seq
+
+
+def shuffled(iterable, seed=None):
+    """A shuffled list of the items in iterable."""
+    return shuffle(list(iterable), seed)
+
+
+def reservoir_sample(iterable, k, seed=None):
+    """k items chosen uniformly from iterable, in one pass.
+
+    Uses Li's algorithm L, which works out how many items to skip rather
+    than drawing a random number per item, so long iterators are mostly
+    skipped with islice. Returns fewer than k items if there aren't k.
+    """
+    if k < 0:
+        raise ValueError("k must not be negative")
+    rng = _rng(seed)
+    it = iter(iterable)
+    reservoir = list(islice(it, k))
+    if len(reservoir) < k or k == 0:
+        return reservoir
+    w = math.exp(math.log(rng.random()) / k)
+    while True:
+        skip = math.floor(math.log(rng.random()) / math.log(1 - w))
+        item = next(islice(it, skip, None), _END)
+        if item is _END:
+            return reservoir
+        reservoir[rng.randrange(k)] = item
+        w *= math.exp(math.log(rng.random()) / k)
+
+
+def _shuffle_lines(src, dst, max_memory, rng, tmpdir, n_lines=None):
+    import tempfile
+    # src and dst are open binary files, n_lines is how many lines src
+    # holds if it's one of our buckets.
+    size = os.fstat(src.fileno()).st_size - src.tell()
+    if size <= max_memory or n_lines == 1:
+        # A single line can't be split up any further, however long.
+        lines = src.readlines()
+        if lines and not lines[-1].endswith(b"\n"):
+            lines[-1] += b"\n"
+        rng.shuffle(lines)
+        dst.writelines(lines)
+        return
+
+    # Scatter every line into a random bucket, then shuffle each bucket.
+    # Aim for buckets of half max_memory so most fit first time, a bucket
+    # that is still too big is shuffled the same way again.
+    n_buckets = int(2 * size // max_memory) + 1
+    buckets = [tempfile.TemporaryFile(dir=tmpdir) for _ in range(n_buckets)]
+    counts = [0] * n_buckets
+    try:
+        choose = rng.randrange
+        for line in src:
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            i = choose(n_buckets)
+            buckets[i].write(line)
+            counts[i] += 1
+        for bucket, count in zip(buckets, counts):
+            bucket.seek(0)
+            _shuffle_lines(bucket, dst, max_memory, rng, tmpdir, count)
+    finally:
+        for bucket in buckets:
+            bucket.close()
+
+
+def shuffle_file(src_path, dst_path, max_memory=1 << 28, seed=None,
+                 tmpdir=None):
+    """Shuffle the lines of a file that may not fit in memory.
+
+    Lines are scattered at random into temporary files of about max_memory
+    / 2 bytes, which are each shuffled in memory and written out in turn.
+    That gives every ordering the same chance, like shuffling in memory
+    would. A missing newline at the end of the file is added. A line longer
+    than max_memory is still read into memory whole, on its own.
+    """
+    rng = _rng(seed)
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        _shuffle_lines(src, dst, max_memory, rng, tmpdir)
+
+
+def shuffle_file_in_place(path, max_memory=1 << 28, seed=None):
+    """shuffle_file writing back over path."""
+    import shutil
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory)
+    os.close(fd)
+    try:
+        shuffle_file(path, tmp, max_memory, seed, directory)
+        shutil.move(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,70 @@
+"""Join an iterable straight into a file or socket.
+
+", ".join(cpd_lst) beats repeated += but it still needs all of cpd_lst in
+memory and builds one string holding the whole result. join_to writes the
+same bytes out a chunk at a time instead, so it can take a generator and
+memory stays at about buffer_size:
+
+    with open("export.csv", "wb") as f:
+        join_to(f, "\\n", (format_row(row) for row in rows))
+
+The sink can be a text file, a binary file or BytesIO, or a socket. Strings
+going to a binary sink or a socket are encoded with encoding. The output is
+exactly separator.join(iterable), encoded if need be.
+
+iter_join gives the chunks as a generator if you want to write them
+yourself.
+"""
+import io
+
+
+def iter_join(separator, iterable, buffer_size=1 << 16):
+    """Yield chunks that add up to separator.join(iterable).
+
+    Each chunk is about buffer_size characters (or bytes), more if a single
+    item is bigger than that.
+    """
+    chunk = []
+    size = 0
+    first = True
+    sep_len = len(separator)
+    for item in iterable:
+        if first:
+            first = False
+        else:
+            chunk.append(separator)
+            size += sep_len
+        chunk.append(item)
+        size += len(item)
+        if size >= buffer_size:
+            yield separator[:0].join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield separator[:0].join(chunk)
+
+
+def _writer(sink):
+    # -> (write function, whether it wants bytes)
+    if hasattr(sink, "sendall"):
+        return sink.sendall, True
+    if isinstance(sink, io.TextIOBase):
+        return sink.write, False
+    return sink.write, True
+
+
+def join_to(sink, separator, iterable, buffer_size=1 << 16,
+            encoding="utf-8"):
+    """Write separator.join(iterable) to sink, return how much was written.
+
+    The count is in characters for a text sink and bytes otherwise.
+    """
+    write, wants_bytes = _writer(sink)
+    encode = wants_bytes and isinstance(separator, str)
+    written = 0
+    for chunk in iter_join(separator, iterable, buffer_size):
+        if encode:
+            chunk = chunk.encode(encoding)
+        write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,158 @@
+"""See nested calls as a timeline.
+
+A logger line per call doesn't show that func1 spent its time in
+internal_abstraction. Tracer records a span per call of each decorated
+function, with the span of the decorated call it happened inside as its
+parent, and exports them as Chrome Trace Event JSON, which chrome://tracing
+and https://ui.perfetto.dev open as a flame chart:
+
+    tracer = Tracer()
+
+    @tracer
+    def func1():
+        internal_abstraction("print this")
+
+    @tracer
+    def internal_abstraction(message):
+        ...
+
+    func1()
+    with open("trace.json", "w") as f:
+        tracer.dump(f)
+
+The current span is kept in a ContextVar, so a span started in an asyncio
+task has the span that created the task as its parent. A new thread starts
+without one, its first span is a root. async def functions get a span
+covering the whole awaited call. Tasks run interleaved on one thread, so
+their spans are exported as async events with a track of their own per
+task, keyed by the task's outermost span, instead of on the thread where
+they would overlap without nesting.
+
+Recording a span is two clock reads, a ContextVar set and reset and a list
+append. At most max_events spans are kept, later ones are counted in
+.dropped and thrown away.
+"""
+import os
+import threading
+from contextvars import ContextVar
+from functools import wraps
+from itertools import count
+from time import perf_counter_ns
+
+# inspect.iscoroutinefunction without importing inspect
+_CO_COROUTINE = 0x80
+
+
+class Tracer:
+    def __init__(self, max_events=1000000):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._ids = count(1)
+        self._current = ContextVar("presentations.tracing span", default=0)
+        # (task, its outermost span) for async spans
+        self._track = ContextVar("presentations.tracing track",
+                                 default=(None, 0))
+        self._origin = perf_counter_ns()
+
+    def _record(self, name, start, end, span, parent, track=0):
+        events = self.events
+        if len(events) < self.max_events:
+            events.append((name, start, end, threading.get_ident(), span,
+                           parent, track))
+        else:
+            self.dropped += 1
+
+    def __call__(self, fn):
+        name = fn.__qualname__
+        current = self._current
+        ids = self._ids
+        record = self._record
+
+        code = getattr(fn, "__code__", None)
+        if code is not None and code.co_flags & _CO_COROUTINE:
+            from asyncio import current_task
+            tracks = self._track
+
+            @wraps(fn)
+            async def inner_trace(*args, **kwargs):
+                parent = current.get()
+                span = next(ids)
+                token = current.set(span)
+                # The first span in a task starts its track. Tasks copy the
+                # context they're created in, so the task is kept with it.
+                try:
+                    task = current_task()
+                except RuntimeError:
+                    task = None   # not running in asyncio
+                owner, track = tracks.get()
+                track_token = None
+                if owner is not task or task is None:
+                    track = span
+                    track_token = tracks.set((task, span))
+                start = perf_counter_ns()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    end = perf_counter_ns()
+                    current.reset(token)
+                    if track_token is not None:
+                        tracks.reset(track_token)
+                    record(name, start, end, span, parent, track)
+            return inner_trace
+
+        @wraps(fn)
+        def inner_trace(*args, **kwargs):
+            parent = current.get()
+            span = next(ids)
+            token = current.set(span)
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                end = perf_counter_ns()
+                current.reset(token)
+                record(name, start, end, span, parent)
+        return inner_trace
+
+    def clear(self):
+        self.events = []
+        self.dropped = 0
+
+    def chrome_trace(self):
+        """The spans as a Chrome Trace Event format dict."""
+        pid = os.getpid()
+        origin = self._origin
+        spans, tracks = [], []
+        for name, start, end, tid, span, parent, track in list(self.events):
+            event = {
+                "name": name,
+                "ts": (start - origin) / 1000.0,
+                "pid": pid,
+                "tid": tid,
+                "args": {"span": span, "parent": parent},
+            }
+            if not track:
+                event["ph"] = "X"
+                event["dur"] = (end - start) / 1000.0
+                # Viewers nest spans on a thread by time, start order with
+                # longest first keeps a parent ahead of a child that starts
+                # at the same ns.
+                spans.append(((tid, start, start - end), event))
+                continue
+            begin = dict(event, ph="b", cat="async", id=track)
+            event.update(ph="e", cat="async", id=track,
+                         ts=(end - origin) / 1000.0)
+            # The same for begin and end events on a track, ends going first
+            # so a span ending as the next starts doesn't contain it.
+            tracks.append(((track, start, 1, start - end), begin))
+            tracks.append(((track, end, 0, end - start), event))
+        spans.sort(key=lambda e: e[0])
+        tracks.sort(key=lambda e: e[0])
+        events = [event for _, event in spans + tracks]
+        return {"traceEvents": events, "displayTimeUnit": "ns",
+                "otherData": {"dropped": self.dropped}}
+
+    def dump(self, file_handle):
+        import json
+        json.dump(self.chrome_trace(), file_handle)
@@ -0,0 +1,252 @@
+"""Run small scalar functions over whole arrays.
+
+make_adder(2) adds 2 to one number per Python call. lift wraps a scalar
+function so it still does that for a number, and handles a NumPy array or a
+batch of values in one go:
+
+    add2 = lift(make_adder(2))
+    add2(3)
+    # >>> 5
+    add2(numpy.arange(5))
+    # >>> array([2, 3, 4, 5, 6])
+
+    @lift
+    def double_pair(pair):
+        return (pair[0] * 2, pair[1] * 2)
+
+    double_pair.map([(1, 2), (3, 4)])
+    # >>> [(2, 4), (6, 8)]
+
+For arrays it first traces the function: calls it once with the whole array
+(for tuples, with a tuple of column arrays) and uses the result if it has
+the right shape. Arithmetic on the argument just works that way. If tracing
+fails it falls back to a compiled per-element loop, a numba ufunc when numba
+is installed, and to a plain loop otherwise.
+
+The arrays traced are ones whose arithmetic is the scalar function's.
+Values that are all floats become a float64 array with NumPy's floating
+point errors raised, so 1/x on a zero fails and the loop raises the same
+ZeroDivisionError the scalar function would, instead of the array giving
+inf. Ints are traced as int64, and once more as float64 to see how big the
+results get: int64 would overflow where Python ints don't, so if any result
+comes near the int64 limit they are traced again as an array of the Python
+ints themselves. That is slower but still one call of fn. Anything else is
+traced as an array of Python objects. Each column of a batch of tuples is
+converted on its own, so a column of ints stays ints.
+
+On top of that a handful of elements spread over the input are recomputed
+through the scalar function and compared, and if any differ the plain loop
+is used. That catches functions that give a different type for an array,
+like round(). .path says which path the last call took.
+
+map(items) returns what [fn(item) for item in items] would: a list of
+python values.
+
+NumPy is only imported when an array or batch is passed, numba only if
+tracing fails.
+"""
+import math
+from functools import update_wrapper
+
+_CHECKS = 5
+# Ints up to this size convert to float64 exactly.
+_FLOAT_EXACT = 2 ** 53
+# Results a float64 trace puts below this can't have overflowed int64, the
+# margin is for the float64 rounding.
+_INT64_SAFE = 2.0 ** 62
+
+
+def _same(a, b):
+    if isinstance(a, tuple) or isinstance(b, tuple):
+        return (isinstance(a, tuple) and isinstance(b, tuple)
+                and len(a) == len(b) and all(map(_same, a, b)))
+    if type(a) is not type(b):
+        return False   # 2.0 == 2, but isn't what fn gives
+    if a == b:
+        return True
+    return (isinstance(a, float) and isinstance(b, float)
+            and math.isnan(a) and math.isnan(b))
+
+
+def _exact(numpy, values):
+    # An array whose arithmetic is Python's for values, see the docstring.
+    kinds = set(map(type, values))
+    if kinds == {float}:
+        return numpy.array(values, dtype=numpy.float64)
+    if kinds == {complex}:
+        return numpy.array(values, dtype=numpy.complex128)
+    arr = numpy.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _from_objects(numpy, result):
+    # What numpy.array() of the scalar results would be, like the loop's.
+    if result.dtype == object and result.ndim == 1:
+        return numpy.array(result.tolist())
+    return result
+
+
+def _item(result, i):
+    value = result[i]
+    return value.item() if type(value).__module__ == "numpy" else value
+
+
+def _numba_ufunc(fn):
+    try:
+        import numba
+    except ImportError:
+        return None
+    try:
+        return numba.vectorize(fn)
+    except Exception:
+        return None
+
+
+class Lifted:
+    def __init__(self, fn):
+        self.fn = fn
+        self.path = None
+        self._ufunc = False   # not tried yet
+        update_wrapper(self, fn)
+
+    def __call__(self, x):
+        if type(x).__module__ == "numpy" and hasattr(x, "shape"):
+            return self._array(x)
+        self.path = "scalar"
+        return self.fn(x)
+
+    def map(self, items):
+        """[fn(item) for item in items], computed on arrays if possible."""
+        items = list(items)
+        if not items:
+            return []
+        import numpy
+        if isinstance(items[0], tuple):
+            width = len(items[0])
+            if not all(isinstance(item, tuple) and len(item) == width
+                       for item in items):
+                return self._loop(items)
+            columns = [_exact(numpy, list(column)) for column in zip(*items)]
+            result = self._traced_rows(columns, items)
+            if result is None:
+                return self._loop(items)
+            return result
+        arr = None
+        if all(type(item) is int for item in items):
+            try:
+                arr = numpy.array(items, dtype=numpy.int64)
+            except OverflowError:
+                pass   # too big for int64 already
+        if arr is None:
+            arr = _exact(numpy, items)
+        result = self._any(numpy, arr, items.__getitem__)
+        if result is None:
+            return self._loop(items)
+        return result.tolist()
+
+    def _loop(self, items):
+        self.path = "loop"
+        fn = self.fn
+        return [fn(item) for item in items]
+
+    def _matches(self, result, n, scalar, get):
+        # Spot check a few elements against the scalar function, scalar(i)
+        # is the i-th input as a Python value.
+        step = max(1, n // _CHECKS)
+        indexes = set(range(0, n, step)) | {n - 1}
+        fn = self.fn
+        return all(_same(get(result, i), fn(scalar(i))) for i in indexes)
+
+    def _array(self, arr):
+        import numpy
+        if arr.ndim != 1:
+            return self._array(arr.ravel()).reshape(arr.shape)
+        if not len(arr):
+            self.path = "loop"
+            return numpy.array([self.fn(x) for x in arr.tolist()])
+        result = self._any(numpy, arr, lambda i: arr[i].item())
+        if result is None:
+            return numpy.array(self._loop(arr.tolist()))
+        return _from_objects(numpy, result)
+
+    def _any(self, numpy, arr, scalar):
+        # fn over a 1-d arr of any dtype, see _vector.
+        if arr.dtype in (numpy.float64, numpy.complex128, object):
+            return self._vector(arr, scalar)
+        if arr.dtype.kind in "iu" and -_FLOAT_EXACT <= arr.min() \
+                and arr.max() <= _FLOAT_EXACT:
+            result = self._traced_ints(numpy, arr, scalar)
+            if result is not None:
+                return result
+        return self._vector(_exact(numpy, arr.tolist()), scalar)
+
+    def _traced_ints(self, numpy, arr, scalar):
+        # fn over arr as int64, or None if a result might have overflowed.
+        ints = arr.astype(numpy.int64, copy=False)
+        try:
+            with numpy.errstate(all="raise"):
+                result = numpy.asarray(self.fn(ints))
+                if result.dtype.kind in "iu":
+                    size = numpy.asarray(self.fn(ints.astype(numpy.float64)))
+                    if not (numpy.abs(size) < _INT64_SAFE).all():
+                        return None
+        except Exception:
+            return None
+        if result.shape == arr.shape \
+                and self._matches(result, len(arr), scalar, _item):
+            self.path = "traced"
+            return result
+        return None
+
+    def _vector(self, arr, scalar):
+        # fn over arr, an _exact array, as an array or None if only the
+        # loop will do. Traced on an object array, the result holds the
+        # Python values fn gave.
+        import numpy
+        try:
+            with numpy.errstate(all="raise"):
+                result = numpy.asarray(self.fn(arr))
+        except Exception:
+            result = None
+        if result is not None and result.shape == arr.shape \
+                and self._matches(result, len(arr), scalar, _item):
+            self.path = "traced"
+            return result
+
+        # A compiled loop has fixed size ints too, only trust it with floats.
+        if arr.dtype != object and self._ufunc is False:
+            self._ufunc = _numba_ufunc(self.fn)
+        if arr.dtype != object and self._ufunc is not None:
+            try:
+                with numpy.errstate(all="raise"):
+                    result = self._ufunc(arr)
+            except Exception:
+                result = None
+            if result is not None \
+                    and self._matches(result, len(arr), scalar, _item):
+                self.path = "compiled"
+                return result
+        return None
+
+    def _traced_rows(self, columns, items):
+        # fn gets a tuple of column arrays where it would get one tuple.
+        import numpy
+        try:
+            with numpy.errstate(all="raise"):
+                result = self.fn(tuple(columns))
+        except Exception:
+            return None
+        if not isinstance(result, tuple) or not all(
+                getattr(c, "shape", None) == (len(items),) for c in result):
+            return None
+        rows = list(zip(*(c.tolist() for c in result)))
+        if not self._matches(rows, len(items), items.__getitem__,
+                             lambda rows, i: rows[i]):
+            return None
+        self.path = "traced"
+        return rows
+
+
+def lift(fn):
+    return Lifted(fn)
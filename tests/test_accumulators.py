@@ -0,0 +1,85 @@
+import threading
+from array import array
+
+import pytest
+
+from presentations.accumulators import (Accumulator, ShardedAccumulator,
+                                        make_accumulator)
+
+
+def run_threads(target, n=8):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_accumulator():
+    acc = Accumulator(10)
+    assert acc(5) == 15
+    assert acc(-3) == 12
+    accum = make_accumulator()
+    assert [accum(1), accum(2)] == [1, 3]
+
+
+def test_sharded_accumulator_loses_nothing_across_threads():
+    events = ShardedAccumulator()
+
+    def work():
+        for _ in range(10000):
+            events(1)
+        events.extend([1, 2, 3])
+
+    run_threads(work)
+    assert events.value() == 8 * 10006
+    # Shards of the finished threads have been folded into one total.
+    assert events._shards == []
+    assert events.value() == 8 * 10006
+
+
+def test_sharded_accumulator_reset():
+    events = ShardedAccumulator(5)
+    events(1)
+    assert events.value() == 6
+    events.reset()
+    assert events.value() == 0
+    events.add(2)
+    run_threads(lambda: events(3), n=4)
+    assert events.value() == 14
+    events.reset()
+    assert events.value() == 0
+
+
+def test_extend_list():
+    acc = Accumulator(1)
+    assert acc.extend([1, 2, 3]) == 7
+    assert acc.extend([1, 2], prefix=True) == [8, 10]
+    assert acc.val == 10
+    assert acc.extend([], prefix=True) == []
+
+
+def test_extend_array_totals_need_not_fit_the_typecode():
+    acc = Accumulator()
+    assert acc.extend(array("b", [100, 100]), prefix=True) == [100, 200]
+    assert Accumulator(1000).extend(array("b", [1]), prefix=True) == [1001]
+    assert Accumulator(0.5).extend(array("i", [1, 2]), prefix=True) == \
+        [1.5, 3.5]
+    assert Accumulator().extend(array("d", [0.5, 0.25])) == 0.75
+
+
+def test_extend_numpy():
+    numpy = pytest.importorskip("numpy")
+    acc = Accumulator(1)
+    assert acc.extend(numpy.arange(4)) == 7
+    assert type(acc.val) is int
+    sums = acc.extend(numpy.array([1, 2], dtype=numpy.int8), prefix=True)
+    assert sums.tolist() == [8, 10]
+    assert acc.val == 10 and type(acc.val) is int
+
+
+def test_sharded_extend():
+    events = ShardedAccumulator()
+    events.extend(array("b", [100, 100]))
+    events.extend([1])
+    assert events.value() == 201
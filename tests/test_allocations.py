@@ -0,0 +1,151 @@
+import io
+import sys
+import threading
+import tracemalloc
+
+import pytest
+
+from presentations.allocations import AllocationTracker
+
+MB = 1 << 20
+
+
+@pytest.fixture
+def tracker():
+    was_tracing = tracemalloc.is_tracing()
+    tracker = AllocationTracker()
+    yield tracker
+    tracker.stop()
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def short(name):
+    return name.rsplit(".", 1)[-1]
+
+
+def totals(tracker):
+    return {short(name): totals.as_dict()
+            for name, totals in tracker.functions.items()}
+
+
+def test_allocated_and_retained(tracker):
+    kept = []
+
+    @tracker
+    def temporary():
+        bytearray(MB)
+
+    @tracker
+    def keeping():
+        kept.append(bytearray(MB))
+
+    temporary()
+    keeping()
+    result = totals(tracker)
+    assert result["temporary"]["allocated"] > 0.9 * MB
+    assert result["temporary"]["retained"] < MB
+    assert result["keeping"]["retained"] > 0.9 * MB
+    assert result["keeping"]["calls"] == 1
+
+
+def test_nested_calls_keep_their_peaks(tracker):
+    @tracker
+    def outer():
+        bytearray(2 * MB)
+        inner()
+
+    @tracker
+    def inner():
+        bytearray(MB)
+
+    outer()
+    result = totals(tracker)
+    assert 1.9 * MB < result["outer"]["allocated"] < 3 * MB
+    assert 0.9 * MB < result["inner"]["allocated"] < 2 * MB
+
+
+def test_threads_keep_their_peaks(tracker):
+    allocated, done = threading.Event(), threading.Event()
+
+    @tracker
+    def big():
+        data = bytearray(20 * MB)
+        del data
+        allocated.set()
+        done.wait(5)
+
+    @tracker
+    def small():
+        return [0] * 10
+
+    def other_thread():
+        allocated.wait(5)
+        small()
+        done.set()
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    big()
+    thread.join()
+    result = totals(tracker)
+    assert result["big"]["allocated"] > 19 * MB
+    assert result["small"]["allocated"] < MB
+
+
+def test_call_sites(tracker):
+    @tracker
+    def f():
+        return bytearray(1000)
+
+    line = sys._getframe().f_lineno
+    f()
+    f()
+    f()
+    sites = {(short(name), site): totals.calls
+             for (name, site), totals in tracker.call_sites.items()}
+    assert sites == {("f", "%s:%d" % (__file__, line + 1)): 1,
+                     ("f", "%s:%d" % (__file__, line + 2)): 1,
+                     ("f", "%s:%d" % (__file__, line + 3)): 1}
+
+
+def test_top_and_report(tracker):
+    @tracker
+    def small():
+        bytearray(1000)
+
+    @tracker
+    def big():
+        bytearray(MB)
+
+    small()
+    big()
+    big()
+    top = tracker.top()
+    assert [short(name) for name, _ in top] == ["big", "small"]
+    assert top[0][1]["calls"] == 2
+    assert [short(name) for name, _ in tracker.top(1, by="calls")] == ["big"]
+    assert len(tracker.top(call_sites=True)) == 3
+    with pytest.raises(ValueError):
+        tracker.top(by="speed")
+
+    out = io.StringIO()
+    tracker.report(out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].split() == ["function", "calls", "allocated", "retained",
+                                "blocks"]
+    assert [short(line.split()[0]) for line in lines[1:]] == ["big", "small"]
+    tracker.clear()
+    assert tracker.top() == []
+
+
+def test_sampling(tracker):
+    sampled = AllocationTracker(every=3)
+
+    @sampled
+    def f():
+        pass
+
+    for _ in range(7):
+        f()
+    sampled.stop()
+    assert [totals["calls"] for _, totals in sampled.top()] == [3]
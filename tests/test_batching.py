@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from presentations.batching import MicroBatch
+
+
+def test_calls_are_batched():
+    sizes = []
+
+    @MicroBatch(max_size=10, max_latency=0.05)
+    def double(items):
+        sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    futures = [double.submit(i) for i in range(25)]
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(25)]
+    assert max(sizes) <= 10
+    assert double(4) == 8
+    assert asyncio.run(double.acall(5)) == 10
+    double.close()
+    with pytest.raises(RuntimeError):
+        double(1)
+
+
+def test_submit_racing_close_never_hangs():
+    for _ in range(50):
+        @MicroBatch(max_size=4, max_latency=0.001)
+        def identity(items):
+            return items
+
+        futures = []
+        go = threading.Event()
+
+        def submitter():
+            go.wait()
+            for i in range(20):
+                try:
+                    futures.append(identity.submit(i))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=submitter) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        identity(0)
+        go.set()
+        identity.close()
+        for thread in threads:
+            thread.join()
+        for future in futures:
+            future.result(timeout=5)
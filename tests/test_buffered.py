@@ -0,0 +1,55 @@
+import io
+import threading
+
+import pytest
+
+from presentations.buffered import BufferedWriter
+from presentations.loggers import Logger
+
+
+def run_with_timeout(fn, timeout=5):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "call hung"
+    return result[0]
+
+
+def test_write_after_close_raises():
+    writer = BufferedWriter(io.StringIO(), max_records=5)
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write("late\n")
+
+
+def test_logger_calls_after_close_do_not_hang():
+    out = io.StringIO()
+    log = Logger(out, buffered=True, max_records=5)
+
+    @log
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    log.file_handle.close()
+
+    def call_many():
+        errors = 0
+        for i in range(10):
+            try:
+                add(i, i)
+            except ValueError:
+                errors += 1
+        return errors
+
+    assert run_with_timeout(call_many) == 10
+    assert out.getvalue().count("add(") == 1
+
+
+def test_blocking_write_waits_for_room():
+    out = io.StringIO()
+    with BufferedWriter(out, max_records=2, batch_size=1) as writer:
+        for i in range(50):
+            writer.write("%d\n" % i)
+    assert out.getvalue().splitlines() == [str(i) for i in range(50)]
@@ -0,0 +1,27 @@
+import pytest
+
+from presentations.columnar import Table
+
+
+def test_rejected_value_leaves_columns_aligned():
+    table = Table(["name", "age"], typecodes={"age": "i"})
+    table.append({"name": "John", "age": 80})
+    with pytest.raises(TypeError):
+        table.append({"name": "Graham", "age": "unknown"})
+    with pytest.raises(OverflowError):
+        table.append({"name": "Eric", "age": 2 ** 40})
+    assert len(table) == 1
+    assert len(table.column("name")) == len(table.column("age")) == 1
+    table.append({"name": "Terry", "age": 81})
+    assert table.to_dicts() == [{"name": "John", "age": 80},
+                                {"name": "Terry", "age": 81}]
+
+
+def test_missing_sparse_field_order():
+    table = Table.from_rows([
+        {"fname": "John"},
+        {"fname": "Graham", "status": "deceased"},
+        {"fname": "Eric"},
+    ])
+    assert list(table.order("status")) == [0, 2, 1]
+    assert list(table.order("-status")) == [1, 0, 2]
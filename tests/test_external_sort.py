@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from presentations import external_sort as module
+from presentations.external_sort import external_sort
+
+
+def records(n, seed=1):
+    rng = random.Random(seed)
+    return [{"lname": rng.choice("ABCDE"), "n": i} for i in range(n)]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("fan_in", [2, 3, 64])
+def test_matches_sorted(fan_in, reverse):
+    rows = records(500)
+    key = lambda row: row["lname"]
+    result = list(external_sort(rows, key=key, reverse=reverse, run_size=7,
+                                fan_in=fan_in))
+    assert result == sorted(rows, key=key, reverse=reverse)
+
+
+def test_open_runs_are_bounded(monkeypatch):
+    made = []
+    most_open = []
+    write_run = module._write_run
+
+    def counting_write_run(run, tmpdir):
+        f = write_run(run, tmpdir)
+        made.append(f)
+        most_open.append(sum(not f.closed for f in made))
+        return f
+
+    monkeypatch.setattr(module, "_write_run", counting_write_run)
+    rows = list(range(1000, 0, -1))
+    assert list(external_sort(rows, run_size=1, fan_in=4)) == sorted(rows)
+    # 1000 runs, at most three of each of five levels plus a merge.
+    assert max(most_open) <= 20
+    assert all(f.closed for f in made)
+
+
+def test_fan_in_must_be_at_least_two():
+    with pytest.raises(ValueError):
+        list(external_sort([1], fan_in=1))
@@ -0,0 +1,129 @@
+import functools
+import io
+import itertools
+
+import pytest
+
+from presentations.fusion import Layer, LoggerLayer, fuse, fused_layers
+from presentations.loggers import Logger
+
+
+class Counter(Layer):
+    def __init__(self):
+        self.calls = 0
+
+    def before(self, fn, args, kwargs):
+        self.calls += 1
+
+
+class PlusOne(Layer):
+    def after(self, fn, result):
+        return result + 1
+
+
+def test_stacked_layers_fuse():
+    out = io.StringIO()
+    counter = Counter()
+
+    @LoggerLayer(out)
+    @counter
+    @PlusOne()
+    def one():
+        return 1
+
+    assert one() == 2
+    assert counter.calls == 1
+    assert out.getvalue() == "one(() : {})\n"
+    assert [type(layer) for layer in fused_layers(one)] == [
+        LoggerLayer, Counter, PlusOne]
+    assert one.__wrapped__() == 1
+
+
+def test_other_decorator_ends_fusion():
+    out = io.StringIO()
+    counter = Counter()
+
+    @counter
+    @Logger(out)
+    @PlusOne()
+    def one():
+        return 1
+
+    assert one() == 2
+    assert counter.calls == 1
+    assert out.getvalue().startswith("one(")
+    assert [type(layer) for layer in fused_layers(one)] == [Counter]
+
+
+def test_fuse_all_at_once():
+    counter = Counter()
+    one = fuse(counter, PlusOne(), PlusOne())(lambda: 1)
+    assert one() == 3
+    assert counter.calls == 1
+
+
+class Twice(Layer):
+    def around(self, call, fn, args, kwargs):
+        return call(*args, **kwargs) + call(*args, **kwargs)
+
+
+class Double(Layer):
+    def after(self, fn, result):
+        return result * 2
+
+
+class Trace(Layer):
+    """Every hook, recording the order they run in."""
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def before(self, fn, args, kwargs):
+        self.log.append(self.name + " before")
+
+    def around(self, call, fn, args, kwargs):
+        self.log.append(self.name + " around")
+        return call(*args, **kwargs)
+
+    def after(self, fn, result):
+        self.log.append(self.name + " after")
+        return result + 1
+
+
+def one_by_one(layers, fn):
+    # A plain decorator between every layer ends the fusion each time.
+    for layer in reversed(layers):
+        @functools.wraps(fn)
+        def plain(*args, __fn=fn, **kwargs):
+            return __fn(*args, **kwargs)
+        fn = layer(plain)
+    return fn
+
+
+def test_around_outside_after():
+    @Twice()
+    @PlusOne()
+    def three():
+        return 3
+    assert three() == 8
+    assert fuse(Twice(), PlusOne())(lambda: 2)() == 6
+
+
+@pytest.mark.parametrize("names", list(itertools.permutations(
+    ["twice", "plus", "double", "trace", "counter"], 4)))
+def test_fused_matches_stacking(names):
+    def make(log):
+        counter = Counter()
+        factories = {"twice": Twice, "plus": PlusOne, "double": Double,
+                     "trace": lambda: Trace("t", log),
+                     "counter": lambda: counter}
+        return [factories[name]() for name in names], counter
+
+    fused_log, stacked_log = [], []
+    fused_layers_, fused_counter = make(fused_log)
+    stacked_layers, stacked_counter = make(stacked_log)
+    fused = fuse(*fused_layers_)(lambda x: x + 1)
+    stacked = one_by_one(stacked_layers, lambda x: x + 1)
+    assert fused(5) == stacked(5)
+    assert fused_log == stacked_log
+    assert fused_counter.calls == stacked_counter.calls
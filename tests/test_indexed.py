@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from presentations.indexed import IndexedList
+
+
+def check(indexed, plain):
+    assert list(indexed) == plain
+    for value in set(v for v in plain if not isinstance(v, list)) | {"zz"}:
+        expected = tuple(i for i, v in enumerate(plain) if v == value)
+        assert indexed.positions(value) == expected
+        assert indexed.count(value) == len(expected)
+        assert (value in indexed) == bool(expected)
+        if expected:
+            assert indexed.index(value) == expected[0]
+            assert indexed.index(value, -len(plain)) == expected[0]
+            if len(expected) > 1:
+                assert indexed.index(value, expected[0] + 1) == expected[1]
+            with pytest.raises(ValueError):
+                indexed.index(value, expected[-1] + 1)
+        else:
+            with pytest.raises(ValueError):
+                indexed.index(value)
+
+
+def test_index_stays_consistent():
+    rng = random.Random(7)
+    values = ["a", "b", "c", 1, 2, 2.0]
+    plain = [rng.choice(values) for _ in range(20)]
+    indexed = IndexedList(plain)
+    check(indexed, plain)
+    for step in range(2000):
+        op = rng.choice(["append", "insert", "del", "set", "pop", "pop_end",
+                         "remove", "extend", "slice"])
+        value = rng.choice(values)
+        i = rng.randrange(-len(plain), len(plain)) if plain else 0
+        if op == "append":
+            indexed.append(value)
+            plain.append(value)
+        elif op == "insert":
+            j = rng.randrange(-3, len(plain) + 3)
+            indexed.insert(j, value)
+            plain.insert(j, value)
+        elif op == "extend":
+            indexed.extend([value, value])
+            plain.extend([value, value])
+        elif not plain:
+            continue
+        elif op == "del":
+            del indexed[i]
+            del plain[i]
+        elif op == "set":
+            indexed[i] = value
+            plain[i] = value
+        elif op == "pop":
+            assert indexed.pop(i) == plain.pop(i)
+        elif op == "pop_end":
+            assert indexed.pop() == plain.pop()
+        elif op == "remove":
+            if value in plain:
+                indexed.remove(value)
+                plain.remove(value)
+        else:
+            indexed[1:3] = [value]
+            plain[1:3] = [value]
+        # Look something up now and then so the index gets rebuilt and
+        # the incremental updates are exercised on a live index.
+        if step % 3 == 0:
+            check(indexed, plain)
+    check(indexed, plain)
+
+
+def test_unhashable_values():
+    indexed = IndexedList([[1], "a", [1]])
+    assert [1] in indexed
+    assert indexed.positions([1]) == (0, 2)
+    assert indexed.index([1], 1) == 2
+    assert indexed.count([1]) == 2
+    indexed[0] = "a"
+    assert indexed.positions("a") == (0, 1)
+
+
+def test_behaves_like_a_list():
+    indexed = IndexedList("abca")
+    assert indexed[1:3] == ["b", "c"]
+    assert isinstance(indexed[1:3], IndexedList)
+    indexed += "d"
+    indexed.sort(reverse=True)
+    assert indexed == ["d", "c", "b", "a", "a"]
+    assert indexed.positions("a") == (3, 4)
+    indexed.reverse()
+    assert indexed.index("d") == 4
+    indexed.clear()
+    assert "a" not in indexed
+    assert indexed.index_nbytes() > 0
@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import io
+import threading
+
+from presentations.buffered import BufferedWriter
+from presentations.loggers import Logger, _shared_async_sink, logger
+from presentations.records import CallLog, RecordWriter, read_records
+
+
+def test_async_function_leaves_handle_alone():
+    out = io.StringIO()
+    log = Logger(out)
+
+    @log
+    async def fetch(x):
+        return x
+
+    @log
+    def add(a, b):
+        return a + b
+
+    assert log.file_handle is out
+    assert add(1, 2) == 3
+    assert out.getvalue() == "add((1, 2) : {})\n"
+    assert asyncio.run(fetch(5)) == 5
+    log._async_sink.flush()
+    assert out.getvalue().splitlines()[1].startswith("fetch((5,) : {}) ")
+
+
+def test_async_records_share_names():
+    out = io.BytesIO()
+    log = Logger(out, deferred=True)
+    writer = log.file_handle
+
+    @log
+    async def fetch(x):
+        return x
+
+    @log
+    def add(a, b):
+        return a + b
+
+    assert writer.file_handle is out
+    assert add(1, 2) == 3
+    asyncio.run(fetch(5))
+    log._async_sink.file_handle.flush()
+    out.seek(0)
+    calls = [(name, args) for name, _, args, _ in read_records(out)]
+    assert calls == [("add", (1, 2)), ("fetch", (5,))]
+
+
+def test_logger_function_leaves_record_writer_alone():
+    out = io.BytesIO()
+    writer = RecordWriter(out)
+
+    @logger(log=writer)
+    async def fetch(x):
+        return x
+
+    assert writer.file_handle is out
+    assert not isinstance(writer.file_handle, BufferedWriter)
+
+
+def test_logger_function_shares_async_sink():
+    out = io.BytesIO()
+    writer = RecordWriter(out)
+    started = threading.active_count()
+
+    @logger(log=writer)
+    async def fetch(x):
+        return x
+
+    @logger(log=writer)
+    async def store(x):
+        return x
+
+    assert threading.active_count() == started + 1
+    asyncio.run(fetch(1))
+    asyncio.run(store(2))
+    _shared_async_sink(writer).file_handle.flush()
+    out.seek(0)
+    calls = [(name, args) for name, _, args, _ in read_records(out)]
+    assert calls == [("fetch", (1,)), ("store", (2,))]
+
+
+async def add_async(a, b):
+    return a + b
+
+
+class AsyncAdder:
+    async def __call__(self, a, b):
+        return a + b
+
+
+def test_partials_and_callable_objects():
+    out = io.StringIO()
+    log = Logger(out)
+    add_one = log(functools.partial(add_async, 1))
+    adder = log(AsyncAdder())
+    assert asyncio.run(add_one(2)) == 3
+    assert asyncio.run(adder(2, 3)) == 5
+    add_sync = log(functools.partial(lambda a, b: a + b, 1))
+    assert add_sync(4) == 5
+    log._async_sink.flush()
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "<lambda>((4,) : {})"
+    assert lines[1].startswith("add_async((2,) : {}) ")
+    assert lines[2].startswith("AsyncAdder((2, 3) : {}) ")
+
+
+def test_partial_records():
+    calls = CallLog()
+    add_one = logger(log=calls)(functools.partial(add_async, 1))
+    assert asyncio.run(add_one(2)) == 3
+    assert [(name, args) for name, _, args, _ in calls.records()] \
+        == [("add_async", (2,))]
@@ -0,0 +1,106 @@
+from presentations import memoize
+from presentations.memoize import Memoize
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def counted(maxsize=128, ttl=None):
+    calls = []
+
+    @Memoize(maxsize=maxsize, ttl=ttl)
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        calls.append(message)
+        return prefix + message + suffix
+    return string_stuff, calls
+
+
+def test_every_spelling_shares_one_entry():
+    string_stuff, calls = counted()
+    results = {
+        string_stuff("m", "S ", " E"),                    # simple fast path
+        string_stuff("m", suffix=" E", prefix="S "),
+        string_stuff(message="m", prefix="S ", suffix=" E"),
+        string_stuff("m", "S ", suffix=" E"),
+    }
+    assert results == {"S m E"}
+    assert calls == ["m"]
+    info = string_stuff.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 1, 1)
+
+
+def test_defaults_are_part_of_the_key():
+    string_stuff, calls = counted()
+    string_stuff("m")
+    string_stuff("m", "Here goes:")
+    string_stuff("m", "Here goes:", "... and that's it")   # fast path
+    assert calls == ["m"]
+    string_stuff("m", "other")
+    assert calls == ["m", "m"]
+
+
+def test_var_keyword():
+    calls = []
+
+    @Memoize()
+    def options(**kwargs):
+        calls.append(kwargs)
+        return sorted(kwargs)
+
+    assert options(a=1, b=2) == options(b=2, a=1) == ["a", "b"]
+    assert len(calls) == 1
+
+
+def test_lru_eviction():
+    string_stuff, calls = counted(maxsize=2)
+    string_stuff("a")
+    string_stuff("b")
+    string_stuff("a")           # b is now least recently used
+    string_stuff("c")           # evicts b
+    string_stuff("a")
+    string_stuff("b")
+    assert calls == ["a", "b", "c", "b"]
+    info = string_stuff.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == \
+        (2, 4, 2, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(memoize, "monotonic", clock)
+    string_stuff, calls = counted(ttl=10)
+    string_stuff("a")
+    clock.now += 9
+    string_stuff("a")
+    clock.now += 2
+    string_stuff("a")
+    assert calls == ["a", "a"]
+    info = string_stuff.cache_info()
+    assert (info.hits, info.misses, info.expired) == (1, 2, 1)
+
+
+def test_unhashable_arguments_are_not_cached():
+    calls = []
+
+    @Memoize()
+    def total(values):
+        calls.append(values)
+        return sum(values)
+
+    assert total([1, 2]) == total([1, 2]) == 3
+    assert len(calls) == 2
+    assert total.cache_info().currsize == 0
+
+
+def test_cache_clear():
+    string_stuff, calls = counted()
+    string_stuff("a")
+    string_stuff.cache_clear()
+    assert string_stuff.cache_info() == (0, 0, 0, 0, 128, 0)
+    string_stuff("a")
+    assert calls == ["a", "a"]
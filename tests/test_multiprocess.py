@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from presentations.multiprocess import ProcessSink
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+def test_records_reach_the_file(tmp_path):
+    path = tmp_path / "calls.log"
+    with ProcessSink(str(path), reorder_window=0.01) as sink:
+        for i in range(100):
+            sink.write("line %d\n" % i)
+    assert path.read_text().splitlines() == ["line %d" % i for i in range(100)]
+    stats = sink.stats()
+    assert stats["records"] == 100
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_plain_fork(tmp_path):
+    path = tmp_path / "calls.log"
+    script = textwrap.dedent("""
+        import os, sys
+        from presentations.multiprocess import ProcessSink
+
+        sink = ProcessSink(sys.argv[1], reorder_window=0.01)
+        sink.write("parent\\n")
+        children = []
+        for i in range(3):
+            pid = os.fork()
+            if pid == 0:
+                for j in range(5):
+                    sink.write("child %d %d\\n" % (i, j))
+                sys.exit(0)
+            children.append(pid)
+        for pid in children:
+            os.waitpid(pid, 0)
+        sink.write("parent again\\n")
+        sink.close()
+    """)
+    result = subprocess.run([sys.executable, "-c", script, str(path)],
+                            cwd=ROOT, capture_output=True, text=True,
+                            timeout=60)
+    assert result.returncode == 0
+    assert result.stderr == ""
+    lines = path.read_text().splitlines()
+    assert sorted(lines) == sorted(
+        ["parent", "parent again"]
+        + ["child %d %d" % (i, j) for i in range(3) for j in range(5)])
+    assert lines[0] == "parent"
@@ -0,0 +1,68 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from presentations.parallel import imap, parallel_map
+
+
+def double(a):
+    return a * 2
+
+
+def is_even(a):
+    return a % 2 == 0
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_ordered(executor):
+    lst = list(range(1000))
+    assert parallel_map(double, lst, executor=executor) == \
+        [double(a) for a in lst]
+
+
+def test_fixed_chunksize_and_generator_input(executor):
+    result = parallel_map(double, (a for a in range(100)), chunksize=7,
+                          executor=executor)
+    assert result == [double(a) for a in range(100)]
+
+
+def test_unordered(executor):
+    lst = list(range(1000))
+    result = list(imap(double, lst, ordered=False, executor=executor))
+    assert sorted(result) == [double(a) for a in lst]
+
+
+def test_predicate(executor):
+    lst = list(range(1000))
+    assert parallel_map(double, lst, predicate=is_even, executor=executor) \
+        == [double(a) for a in lst if is_even(a)]
+
+
+def test_empty(executor):
+    assert parallel_map(double, [], executor=executor) == []
+
+
+def test_own_executor():
+    assert parallel_map(double, range(10), workers=2) == \
+        [double(a) for a in range(10)]
+
+
+def test_numpy_array_through_shared_memory(executor):
+    numpy = pytest.importorskip("numpy")
+    arr = numpy.arange(1000, dtype=numpy.int64)
+    result = parallel_map(double, arr, predicate=is_even, executor=executor)
+    assert result == [double(a) for a in arr.tolist() if is_even(a)]
+
+
+def test_numpy_object_array_is_pickled(executor):
+    numpy = pytest.importorskip("numpy")
+    # Made after the workers were started, so they can't have inherited
+    # the objects the array points at.
+    arr = numpy.array([10 ** 30 + i for i in range(100)], dtype=object)
+    assert parallel_map(double, arr, executor=executor) == \
+        [double(a) for a in arr.tolist()]
@@ -0,0 +1,47 @@
+import pytest
+
+from presentations.pipeline import Pipeline
+
+numpy = pytest.importorskip("numpy")
+
+
+def both(source, build):
+    """Results with and without numpy=True."""
+    return (build(Pipeline(source)).to_list(),
+            build(Pipeline(source, numpy=True)).to_list())
+
+
+@pytest.mark.parametrize("source, build", [
+    ([2 ** 62, 3, 4], lambda p: p.map(lambda a: a * 2)),
+    ([2 ** 40, 3], lambda p: p.map(lambda a: a * a)),
+    ([1, 2, 3, 4], lambda p: p.filter(lambda a: a % 2 == 0)
+                              .map(lambda a: a * 2)),
+    ([1, 2.5, 3], lambda p: p.map(lambda a: a * 2)),
+    ([0.5, 1.5, 2.5], lambda p: p.map(lambda a: a * 2)
+                                 .filter(lambda a: a > 1)),
+    ([1e308, 2.0], lambda p: p.map(lambda a: a * 10)),
+])
+def test_numpy_matches_element_by_element(source, build):
+    plain, vectorised = both(source, build)
+    assert vectorised == plain
+    assert [type(x) for x in vectorised] == [type(x) for x in plain]
+
+
+def test_division_by_zero_still_raises():
+    with pytest.raises(ZeroDivisionError):
+        Pipeline([1.0, 0.0], numpy=True).map(lambda a: 1 / a).to_list()
+    with pytest.raises(ZeroDivisionError):
+        Pipeline([1, 0], numpy=True).map(lambda a: 1 // a).to_list()
+
+
+def test_float_source_stays_float64():
+    arr = Pipeline([0.5, 1.5], numpy=True).map(lambda a: a * 2).to_array()
+    assert arr.dtype == numpy.float64
+    assert arr.tolist() == [1.0, 3.0]
+    arr = Pipeline([1, 2], numpy=True).map(lambda a: a * 2).to_array()
+    assert arr.tolist() == [2, 4]
+
+
+def test_ragged_source_runs_element_by_element():
+    source = [(1,), (1, 2)]
+    assert Pipeline(source, numpy=True).map(len).to_list() == [1, 2]
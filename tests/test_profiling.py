@@ -0,0 +1,79 @@
+import io
+import json
+import threading
+
+from presentations import profiling
+from presentations.profiling import (Profiler, _bucket, _bucket_upper,
+                                     _N_BUCKETS, _percentile)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_round_trip():
+    values = list(range(200)) + [2 ** k + d for k in range(8, 64)
+                                 for d in (-1, 0, 1)]
+    for ns in values:
+        index = _bucket(ns)
+        assert 0 <= index < _N_BUCKETS
+        upper = _bucket_upper(index)
+        assert ns <= upper < ns * 1.25 + 1
+        assert _bucket(upper) == index
+        # upper really is the last value in the bucket.
+        assert _bucket(upper + 1) > index
+
+
+def test_buckets_are_in_order():
+    indexes = sorted({_bucket(ns) for ns in range(100000)})
+    uppers = [_bucket_upper(i) for i in indexes]
+    assert uppers == sorted(set(uppers))
+    assert uppers[-1] >= 99999
+
+
+def test_percentiles():
+    buckets = [0] * _N_BUCKETS
+    for ns in [1000] * 98 + [10 ** 6, 10 ** 9]:
+        buckets[_bucket(ns)] += 1
+    assert _percentile(buckets, 100, 0.5) == _bucket_upper(_bucket(1000)) / 1e9
+    assert _percentile(buckets, 100, 0.99) == \
+        _bucket_upper(_bucket(10 ** 6)) / 1e9
+    assert _percentile(buckets, 100, 0.999) == \
+        _bucket_upper(_bucket(10 ** 9)) / 1e9
+    assert _percentile([0] * _N_BUCKETS, 0, 0.5) == 0.0
+
+
+def test_self_time_and_threads(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(profiling, "perf_counter_ns", clock)
+    profiler = Profiler()
+
+    @profiler
+    def inner():
+        clock.now += 300
+
+    @profiler
+    def outer():
+        clock.now += 100
+        inner()
+
+    outer()
+    thread = threading.Thread(target=inner)
+    thread.start()
+    thread.join()
+    snapshot = profiler.snapshot()
+    assert snapshot["test_self_time_and_threads.<locals>.outer"]["total"] \
+        == 400 / 1e9
+    assert snapshot["test_self_time_and_threads.<locals>.outer"]["self"] \
+        == 100 / 1e9
+    assert snapshot["test_self_time_and_threads.<locals>.inner"]["calls"] == 2
+
+    out = io.StringIO()
+    profiler.dump(out)
+    assert json.loads(out.getvalue()).keys() == snapshot.keys()
+    profiler.reset()
+    assert all(stats["calls"] == 0 for stats in profiler.snapshot().values())
@@ -0,0 +1,81 @@
+import io
+import time
+
+from presentations.buffered import BufferedWriter
+from presentations.loggers import Logger
+from presentations.records import (CallLog, RecordWriter, format_call,
+                                   read_records)
+
+
+class Thing:
+    def __repr__(self):
+        return "<thing>"
+
+
+def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+    return prefix + message + suffix
+
+
+def read(out):
+    out.seek(0)
+    return [(name, args, kwargs) for name, _, args, kwargs
+            in read_records(out)]
+
+
+def test_values_round_trip():
+    out = io.BytesIO()
+    writer = RecordWriter(out)
+    fn_id = writer.register(string_stuff)
+    writer.record(fn_id, ("my message",), {"prefix": "START", "n": 1.5})
+    writer.record(fn_id, ((1, 2), [3]), {})
+    assert read(out) == [
+        ("string_stuff", ("my message",), {"prefix": "START", "n": 1.5}),
+        ("string_stuff", ((1, 2), [3]), {}),
+    ]
+
+
+def test_unmarshallable_arguments_are_stored_as_reprs():
+    out = io.BytesIO()
+    writer = RecordWriter(out)
+    writer.record(writer.register(string_stuff), (Thing(), "x"),
+                  {"key": Thing()})
+    [(name, args, kwargs)] = read(out)
+    assert format_call(name, args, kwargs) == \
+        "string_stuff((<thing>, 'x') : {'key': <thing>})"
+
+
+def test_deferred_logger_matches_eager_text():
+    calls = CallLog()
+    eager = io.StringIO()
+    deferred = Logger(calls, deferred=True)(string_stuff)
+    logged = Logger(eager)(string_stuff)
+    for fn in (deferred, logged):
+        fn("my message", prefix="START", suffix="END")
+    assert list(calls) == eager.getvalue().splitlines()
+
+
+def test_truncated_record_is_ignored():
+    out = io.BytesIO()
+    writer = RecordWriter(out)
+    writer.record(writer.register(string_stuff), ("a",), {})
+    writer.record(writer.register(string_stuff), ("b",), {})
+    data = out.getvalue()[:-3]
+    assert [args for _, args, _ in read(io.BytesIO(data))] == [("a",)]
+
+
+def test_binary_drops_are_not_reported_as_text():
+    out = io.BytesIO()
+    buffered = BufferedWriter(out, max_records=1, on_full="count",
+                              flush_interval=0.001)
+    writer = RecordWriter(buffered)
+    fn_id = writer.register(string_stuff)
+    buffered.flush()
+    for i in range(50):
+        writer.record(fn_id, (i,), {})
+    # Let a few flushes with nothing to write go by after the drops.
+    time.sleep(0.05)
+    buffered.close()
+    assert buffered.errors == 0
+    records = read(out)
+    assert records[0][0] == "string_stuff"
+    assert len(records) + buffered.dropped == 50
@@ -0,0 +1,102 @@
+import struct
+
+import pytest
+
+from presentations.loggers import Logger
+from presentations.ring import _HEADER, RingLog, main, read_ring
+
+
+def payloads(path):
+    return [payload for _, _, payload in read_ring(path)]
+
+
+def test_wraps_around_keeping_the_newest(tmp_path):
+    path = tmp_path / "calls.ring"
+    with RingLog(path, slots=4, slot_size=32) as ring:
+        for i in range(10):
+            ring.write("record %d\n" % i)
+    records = read_ring(path)
+    assert [seq for seq, _, _ in records] == [6, 7, 8, 9]
+    assert [payload for _, _, payload in records] \
+        == [b"record %d\n" % i for i in range(6, 10)]
+
+
+def test_long_records_are_truncated(tmp_path):
+    path = tmp_path / "calls.ring"
+    with RingLog(path, slots=2, slot_size=24) as ring:
+        assert ring.write("x" * 10) == 10
+    assert payloads(path) == [b"x" * 6]
+
+
+def test_reopening_carries_on(tmp_path):
+    path = tmp_path / "calls.ring"
+    with RingLog(path, slots=4, slot_size=32) as ring:
+        ring.write("a")
+        ring.write("b")
+    with RingLog(path, slots=4, slot_size=32) as ring:
+        ring.write("c")
+    assert [(seq, payload) for seq, _, payload in read_ring(path)] \
+        == [(0, b"a"), (1, b"b"), (2, b"c")]
+
+
+def test_reopening_after_a_crash(tmp_path):
+    path = tmp_path / "calls.ring"
+    ring = RingLog(path, slots=4, slot_size=32)
+    for i in range(6):
+        ring.write("before %d" % i)
+    # What the OS leaves behind when the process dies: the pages, but no
+    # close() bringing the header's sequence number up to date.
+    ring._map.flush()
+    ring._map.close()
+    assert _HEADER.unpack_from(path.read_bytes())[4] == 0
+
+    with RingLog(path, slots=4, slot_size=32) as ring:
+        ring.write("after")
+    records = read_ring(path)
+    assert [seq for seq, _, _ in records] == [3, 4, 5, 6]
+    assert records[-1][2] == b"after"
+
+
+def test_half_written_slot_is_skipped(tmp_path):
+    path = tmp_path / "calls.ring"
+    with RingLog(path, slots=4, slot_size=32) as ring:
+        ring.write("whole")
+        ring.write("half")
+        # A writer stopped between marking the slot empty and publishing.
+        struct.pack_into("<Q", ring._map, _HEADER.size + 32, 0)
+    assert payloads(path) == [b"whole"]
+
+
+def test_other_geometry_starts_afresh(tmp_path):
+    path = tmp_path / "calls.ring"
+    with RingLog(path, slots=4, slot_size=32) as ring:
+        ring.write("old")
+    with RingLog(path, slots=8, slot_size=32) as ring:
+        ring.write("new")
+    assert [(seq, payload) for seq, _, payload in read_ring(path)] \
+        == [(0, b"new")]
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        RingLog(tmp_path / "r", slot_size=10)
+    with pytest.raises(ValueError):
+        RingLog(tmp_path / "r", slots=0)
+    (tmp_path / "other").write_bytes(b"\0" * 100)
+    with pytest.raises(ValueError):
+        read_ring(tmp_path / "other")
+
+
+def test_logger_and_main(tmp_path, capsys):
+    path = tmp_path / "calls.ring"
+    ring = RingLog(path, slots=8, slot_size=64)
+
+    @Logger(ring)
+    def add(a, b):
+        return a + b
+
+    add(1, 2)
+    ring.close()
+    assert main([str(path)]) == 0
+    assert capsys.readouterr().out.endswith(" add((1, 2) : {})\n")
+    assert main([]) == 2
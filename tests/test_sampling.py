@@ -0,0 +1,69 @@
+import threading
+
+from presentations import sampling
+from presentations.sampling import Sampler, make_sampler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_every():
+    sampler = Sampler(every=3)
+    assert [sampler() for _ in range(7)] == [True, False, False, True,
+                                             False, False, True]
+    assert (sampler.kept, sampler.suppressed) == (3, 4)
+
+
+def test_fraction_is_seeded():
+    first = Sampler(fraction=0.5, seed=4)
+    second = Sampler(fraction=0.5, seed=4)
+    assert [first() for _ in range(100)] == [second() for _ in range(100)]
+    assert 20 < first.kept < 80
+
+
+def test_per_second(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sampling, "monotonic", clock)
+    sampler = Sampler(per_second=2)
+    assert [sampler() for _ in range(3)] == [True, True, False]
+    clock.now += 0.5
+    assert [sampler() for _ in range(2)] == [True, False]
+
+
+def test_per_second_below_one(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sampling, "monotonic", clock)
+    sampler = Sampler(per_second=0.5)
+    assert [sampler() for _ in range(3)] == [True, False, False]
+    clock.now += 1
+    assert not sampler()
+    clock.now += 1
+    assert [sampler() for _ in range(2)] == [True, False]
+
+
+def test_counts_are_exact_across_threads():
+    sampler = Sampler(every=3)
+
+    def call():
+        for _ in range(3000):
+            sampler()
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sampler.calls == 24000
+    assert (sampler.kept, sampler.suppressed) == (8000, 16000)
+    sampler.reset()
+    assert (sampler.calls, sampler.kept) == (0, 0)
+
+
+def test_make_sampler():
+    assert make_sampler() is None
+    assert isinstance(make_sampler(every=2), Sampler)
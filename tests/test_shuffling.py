@@ -0,0 +1,92 @@
+import random
+from collections import Counter
+
+import pytest
+
+from presentations.shuffling import (reservoir_sample, shuffle, shuffle_file,
+                                     shuffle_file_in_place, shuffled)
+
+
+def test_seeded_shuffles_repeat():
+    assert shuffled(range(100), seed=1) == shuffled(range(100), seed=1)
+    assert shuffled(range(100), seed=1) != shuffled(range(100), seed=2)
+    assert sorted(shuffled(range(100), seed=1)) == list(range(100))
+    lst = list(range(100))
+    assert shuffle(lst, seed=1) is lst
+    assert lst == shuffled(range(100), seed=1)
+
+
+def test_shared_random_stream():
+    rng = random.Random(3)
+    first, second = shuffled(range(20), rng), shuffled(range(20), rng)
+    assert first != second
+    rng = random.Random(3)
+    assert [shuffled(range(20), rng), shuffled(range(20), rng)] \
+        == [first, second]
+
+
+def test_reservoir_sample():
+    sample = reservoir_sample(iter(range(10000)), 10, seed=5)
+    assert len(sample) == len(set(sample)) == 10
+    assert all(0 <= x < 10000 for x in sample)
+    assert sample == reservoir_sample(range(10000), 10, seed=5)
+    assert reservoir_sample(range(3), 10) == [0, 1, 2]
+    assert reservoir_sample(range(3), 0) == []
+    with pytest.raises(ValueError):
+        reservoir_sample(range(3), -1)
+
+
+def test_reservoir_sample_is_uniform():
+    rng = random.Random(0)
+    counts = Counter()
+    for _ in range(2000):
+        counts.update(reservoir_sample(range(20), 5, rng))
+    # 500 expected each, a biased sampler is far outside this.
+    assert all(400 < counts[x] < 600 for x in range(20))
+
+
+def write_lines(path, lines):
+    path.write_bytes(b"".join(line + b"\n" for line in lines))
+
+
+@pytest.mark.parametrize("max_memory", [1 << 20, 200, 20])
+def test_shuffle_file(tmp_path, max_memory):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    lines = [b"line %d" % i for i in range(500)]
+    write_lines(src, lines)
+    shuffle_file(src, dst, max_memory=max_memory, seed=7)
+    out = dst.read_bytes().splitlines()
+    assert sorted(out) == sorted(lines)
+    assert out != lines
+    again = tmp_path / "again"
+    shuffle_file(src, again, max_memory=max_memory, seed=7)
+    assert again.read_bytes() == dst.read_bytes()
+
+
+def test_lines_longer_than_max_memory(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write_lines(src, [b"x" * 100])
+    shuffle_file(src, dst, max_memory=50)
+    assert dst.read_bytes() == b"x" * 100 + b"\n"
+
+    lines = [bytes([c]) * 100 for c in b"abcdefgh"]
+    write_lines(src, lines)
+    shuffle_file(src, dst, max_memory=50, seed=1)
+    assert sorted(dst.read_bytes().splitlines()) == lines
+
+
+def test_missing_final_newline(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(b"a\nb\nc")
+    shuffle_file(src, dst, max_memory=2, seed=1)
+    assert sorted(dst.read_bytes().splitlines(keepends=True)) \
+        == [b"a\n", b"b\n", b"c\n"]
+
+
+def test_shuffle_file_in_place(tmp_path):
+    path = tmp_path / "data"
+    lines = [b"%d" % i for i in range(100)]
+    write_lines(path, lines)
+    shuffle_file_in_place(path, max_memory=50, seed=3)
+    assert sorted(path.read_bytes().splitlines()) == sorted(lines)
+    assert [p.name for p in tmp_path.iterdir()] == ["data"]
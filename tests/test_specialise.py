@@ -0,0 +1,36 @@
+import pytest
+
+from presentations.specialise import make_wrapper
+
+
+def test_hook_must_take_extra_positionals():
+    def g(x, *rest):
+        return (x,) + rest
+
+    with pytest.raises(TypeError):
+        make_wrapper(g, before=lambda x: None)
+    seen = []
+    wrapped = make_wrapper(g, before=lambda x, *rest: seen.append(rest))
+    assert wrapped(1, 2, 3) == (1, 2, 3)
+    assert seen == [(2, 3)]
+
+
+def test_hook_must_take_extra_keywords():
+    def g(x, **options):
+        return x, options
+
+    with pytest.raises(TypeError):
+        make_wrapper(g, before=lambda x: None)
+    wrapped = make_wrapper(g, before=lambda x, **options: None)
+    assert wrapped(1, a=2) == (1, {"a": 2})
+
+
+def test_hook_with_matching_signature():
+    def string_stuff(message, prefix="Here goes:", suffix="... and that's it"):
+        return prefix + message + suffix
+
+    calls = []
+    wrapped = make_wrapper(string_stuff,
+                           before=lambda *args: calls.append(args))
+    assert wrapped("m", suffix="!") == "Here goes:m!"
+    assert calls == [("m", "Here goes:", "!")]
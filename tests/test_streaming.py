@@ -0,0 +1,70 @@
+import io
+import socket
+import threading
+
+import pytest
+
+from presentations.streaming import iter_join, join_to
+
+CPD = ["Monty", "Python's", "Flying", "Circus", "é"] * 50
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 1 << 16])
+def test_iter_join(buffer_size):
+    chunks = list(iter_join(", ", iter(CPD), buffer_size))
+    assert "".join(chunks) == ", ".join(CPD)
+    if buffer_size == 7:
+        assert len(chunks) > 1
+    assert list(iter_join(", ", [], buffer_size)) == []
+    assert b"".join(iter_join(b"-", [b"a", b"b"], buffer_size)) == b"a-b"
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 1 << 16])
+def test_text_sink(buffer_size):
+    out = io.StringIO()
+    written = join_to(out, ", ", (word for word in CPD), buffer_size)
+    assert out.getvalue() == ", ".join(CPD)
+    assert written == len(", ".join(CPD))
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 1 << 16])
+def test_binary_sink(buffer_size):
+    out = io.BytesIO()
+    written = join_to(out, ", ", CPD, buffer_size, encoding="utf-8")
+    expected = ", ".join(CPD).encode("utf-8")
+    assert out.getvalue() == expected
+    assert written == len(expected)
+    out = io.BytesIO()
+    join_to(out, b"\n", [w.encode("utf-8") for w in CPD], buffer_size)
+    assert out.getvalue() == b"\n".join(w.encode("utf-8") for w in CPD)
+
+
+def test_text_file_and_binary_file(tmp_path):
+    with open(tmp_path / "t.txt", "w", encoding="utf-8") as f:
+        join_to(f, "\n", CPD)
+    with open(tmp_path / "b.txt", "wb") as f:
+        join_to(f, "\n", CPD)
+    assert (tmp_path / "t.txt").read_bytes() == \
+        (tmp_path / "b.txt").read_bytes() == "\n".join(CPD).encode("utf-8")
+
+
+def test_socket_sink():
+    left, right = socket.socketpair()
+    received = []
+
+    def read():
+        while True:
+            data = right.recv(4096)
+            if not data:
+                break
+            received.append(data)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    with left:
+        written = join_to(left, ", ", CPD * 100, buffer_size=1000)
+    reader.join()
+    right.close()
+    expected = ", ".join(CPD * 100).encode("utf-8")
+    assert b"".join(received) == expected
+    assert written == len(expected)
@@ -0,0 +1,109 @@
+import asyncio
+import io
+import json
+import threading
+
+from presentations.tracing import Tracer
+
+
+def spans(tracer):
+    # name -> (span, parent, track), names are qualnames of local functions
+    return {name.rsplit(".", 1)[-1]: (span, parent, track)
+            for name, _, _, _, span, parent, track in tracer.events}
+
+
+def test_parents():
+    tracer = Tracer()
+
+    @tracer
+    def outer():
+        inner()
+        thread = threading.Thread(target=in_thread)
+        thread.start()
+        thread.join()
+
+    @tracer
+    def inner():
+        pass
+
+    @tracer
+    def in_thread():
+        pass
+
+    outer()
+    ids = spans(tracer)
+    assert ids["outer"][1] == 0
+    assert ids["inner"][1] == ids["outer"][0]
+    # Threads don't inherit the context, a new thread starts a root span.
+    assert ids["in_thread"][1] == 0
+    assert len({span for span, _, _ in ids.values()}) == 3
+
+
+def test_async_tasks_get_their_own_tracks():
+    tracer = Tracer()
+
+    @tracer
+    async def main():
+        await asyncio.gather(task_a(), task_b())
+
+    @tracer
+    async def task_a():
+        await asyncio.sleep(0.01)
+        await step_a()
+
+    @tracer
+    async def task_b():
+        await asyncio.sleep(0.005)
+
+    @tracer
+    async def step_a():
+        sync_step()
+
+    @tracer
+    def sync_step():
+        pass
+
+    asyncio.run(main())
+    ids = spans(tracer)
+    assert ids["task_a"][1] == ids["task_b"][1] == ids["main"][0]
+    assert ids["step_a"][1] == ids["task_a"][0]
+    assert ids["sync_step"][1] == ids["step_a"][0]
+    # gather runs each in a task of its own, step_a stays on task_a's.
+    assert ids["main"][2] == ids["main"][0]
+    assert ids["task_a"][2] == ids["task_a"][0]
+    assert ids["task_b"][2] == ids["task_b"][0]
+    assert ids["step_a"][2] == ids["task_a"][0]
+    assert ids["sync_step"][2] == 0
+
+    events = tracer.chrome_trace()["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] \
+        == ["test_async_tasks_get_their_own_tracks.<locals>.sync_step"]
+    # Begin and end events nest properly on every track.
+    stacks = {}
+    for event in events:
+        if event["ph"] == "b":
+            stacks.setdefault(event["id"], []).append(event["name"])
+        elif event["ph"] == "e":
+            assert stacks[event["id"]].pop() == event["name"]
+    assert all(not stack for stack in stacks.values())
+    assert len(stacks) == 3
+
+
+def test_max_events_and_dropped():
+    tracer = Tracer(max_events=3)
+
+    @tracer
+    def f():
+        pass
+
+    for _ in range(5):
+        f()
+    assert len(tracer.events) == 3
+    assert tracer.dropped == 2
+    out = io.StringIO()
+    tracer.dump(out)
+    trace = json.loads(out.getvalue())
+    assert len(trace["traceEvents"]) == 3
+    assert trace["otherData"] == {"dropped": 2}
+    tracer.clear()
+    assert tracer.events == [] and tracer.dropped == 0
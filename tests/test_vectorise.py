@@ -0,0 +1,89 @@
+import pytest
+
+from presentations.vectorise import lift
+
+numpy = pytest.importorskip("numpy")
+
+
+@lift
+def double_pair(pair):
+    return (pair[0] * 2, pair[1] * 2)
+
+
+def test_ints_do_not_overflow():
+    square = lift(lambda x: x * x)
+    values = [2 ** 62, 3, 2 ** 40, 5, 7, 11, 13, 17]
+    assert square.map(values) == [x * x for x in values]
+    assert square.path == "traced"
+
+
+def test_division_by_zero_raises_like_the_scalar_function():
+    inverse = lift(lambda x: 1 / x)
+    with pytest.raises(ZeroDivisionError):
+        inverse.map([1.0, 2.0, 0.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+    with pytest.raises(ZeroDivisionError):
+        inverse.map([1, 2, 0, 4, 5, 6, 7, 8])
+
+
+def test_tuple_columns_keep_their_types():
+    result = double_pair.map([(1, 2.5), (3, 4)])
+    assert result == [(2, 5.0), (6, 8)]
+    assert [type(x) for row in result for x in row] == [int, float, int, int]
+
+
+def test_mixed_ints_and_floats_keep_their_types():
+    result = lift(lambda x: x * 2).map([1, 2.5, 3])
+    assert [type(x) for x in result] == [int, float, int]
+
+
+def test_arrays():
+    add2 = lift(lambda x: x + 2)
+    assert add2(3) == 5
+    assert add2.path == "scalar"
+    assert add2(numpy.arange(5)).tolist() == [2, 3, 4, 5, 6]
+    assert add2.path == "traced"
+    assert add2(numpy.array([0.5, 1.5])).dtype == numpy.float64
+
+
+def test_branching_falls_back_to_loop():
+    absolute = lift(lambda x: x if x > 0 else -x)
+    assert absolute.map([-1, 2, -3]) == [1, 2, 3]
+    assert absolute.path == "loop"
+
+
+def test_loop_keeps_python_values():
+    absolute = lift(lambda x: x if x > 0 else -x)
+    result = absolute.map([-1, 2.5, -3])
+    assert result == [1, 2.5, 3]
+    assert [type(x) for x in result] == [int, float, int]
+
+
+def test_wrong_type_from_array_falls_back():
+    rounded = lift(lambda x: round(x))
+    result = rounded.map([1.5, 2.5, 3.0])
+    assert result == [2, 2, 3]
+    assert [type(x) for x in result] == [int, int, int]
+
+
+def test_int_arrays_trace_in_int64():
+    add2 = lift(lambda x: x + 2)
+    result = add2(numpy.arange(246, 256, dtype=numpy.uint8))
+    assert result.tolist() == [x + 2 for x in range(246, 256)]
+    assert result.dtype == numpy.int64
+    assert add2.path == "traced"
+
+
+def test_int_arrays_that_would_overflow_use_python_ints():
+    # Largest in the middle, so the ends alone wouldn't show it.
+    bump = lift(lambda x: x * (2 ** 32 - x) * 2 ** 32)
+    values = numpy.arange(0, 2 ** 32, 2 ** 24)
+    expected = [x * (2 ** 32 - x) * 2 ** 32 for x in values.tolist()]
+    assert bump(values).tolist() == expected
+    assert bump.map(values.tolist()) == expected
+    assert bump.path == "traced"
+
+
+def test_int_division_by_zero_raises():
+    inverse = lift(lambda x: 1 / x)
+    with pytest.raises(ZeroDivisionError):
+        inverse(numpy.arange(8))